@@ -3,10 +3,12 @@
 A utility module for pulling data from the AdventOfCode site.
 """
 import sys
-from typing import Optional
+from typing import Optional, Tuple
 from pathlib import Path
 from datetime import date
+from dataclasses import dataclass
 import argparse
+import json
 import logging
 
 import requests
@@ -15,6 +17,11 @@ import requests
 SESSION_KEY_FILENAME = "session_key.txt"
 
 URL_TMPL = "https://adventofcode.com/{year}/day/{day}{path}"
+CACHE_DIRNAME = ".aoc_cache"
+
+# Pages that never change once published, so are served from the cache
+# without revalidation.
+IMMUTABLE_PATHS = ("/input",)
 USER_AGENT = "https://github.com/tomp/AOC-2022 by pollard.tom@gmail.com"
 
 THIS_YEAR = str(date.today().year)
@@ -46,12 +53,60 @@ def add_arguments(parser: argparse.ArgumentParser) -> None:
         default=SESSION_KEY_FILENAME,
         help="name of text file containing the session key",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download pages, rather than using the local page cache",
+    )
+
+
+@dataclass
+class CachedPage:
+    """A CachedPage is a downloaded page, with the headers used to revalidate it."""
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class PageCache:
+    """A PageCache keeps downloaded pages on disk, keyed by year, day, and path.
+    Each page's body is stored alongside a small JSON file holding its ETag and
+    Last-Modified headers.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _paths(self, year: str, day: str, path: str) -> Tuple[Path, Path]:
+        name = path.strip("/").replace("/", "_") or "page"
+        base = self.directory / str(year) / str(day) / name
+        return base.with_suffix(".body"), base.with_suffix(".json")
+
+    def get(self, year: str, day: str, path: str) -> Optional[CachedPage]:
+        body_file, meta_file = self._paths(year, day, path)
+        try:
+            body = body_file.read_bytes()
+            meta = json.loads(meta_file.read_text())
+        except (OSError, ValueError):
+            return None
+        return CachedPage(body, meta.get("etag"), meta.get("last_modified"))
+
+    def put(self, year: str, day: str, path: str, page: CachedPage) -> None:
+        body_file, meta_file = self._paths(year, day, path)
+        body_file.parent.mkdir(parents=True, exist_ok=True)
+        body_file.write_bytes(page.body)
+        meta = {"etag": page.etag, "last_modified": page.last_modified}
+        meta_file.write_text(json.dumps(meta))
 
 
 class Client:
     """A Client instance holds state for accessing pages on the adventofcode website.
     It wraps the low-level code for downloading paricular pages from that website,
     on behalf of an authenticated user.
+
+    Pages are kept in an on-disk cache, unless cache_dir is None.  Cached pages
+    are revalidated with a conditional GET, except for the puzzle inputs, which
+    never change.
     """
 
     def __init__(
@@ -59,10 +114,14 @@ class Client:
         year: Optional[str] = None,
         day: Optional[str] = None,
         session: Optional[str] = None,
+        cache_dir: Optional[Path] = BASE_DIR / CACHE_DIRNAME,
+        url_template: str = URL_TMPL,
     ):
         self.year = year or THIS_YEAR
         self.day = day or THIS_DAY
         self.session_filename = session
+        self.url_template = url_template
+        self.cache = PageCache(cache_dir) if cache_dir else None
 
         self._headers = {"User-Agent": USER_AGENT}
         self._cookies = {}
@@ -79,18 +138,47 @@ class Client:
         year: str = "",
         day: str = "",
         path: str = "",
-        raw: bool = False
+        raw: bool = False,
+        check: bool = False,
     ):
+        """Return the text of a page.  If check is true, an error response
+        raises requests.HTTPError instead of being returned.
+        """
         if not year:
             year = self.year
         if not day:
             day = self.day
         if path and not path.startswith("/"):
             path = "/" + path
-        url = URL_TMPL.format(year=year, day=day, path=path)
-        resp = self.session.get(url, headers=self._headers, cookies=self._cookies)
+        url = self.url_template.format(year=year, day=day, path=path)
+
+        cached = self.cache.get(year, day, path) if self.cache else None
+        if cached and path in IMMUTABLE_PATHS:
+            logger.debug(f"CACHED: {url}")
+            return cached.body.decode()
+
+        headers = dict(self._headers)
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        resp = self.session.get(url, headers=headers, cookies=self._cookies)
         logger.debug(f"REQ: {resp.request.url}")
         logger.debug(f"OK: {resp.ok}")
+        if cached and resp.status_code == 304:
+            logger.debug(f"NOT MODIFIED: {url}")
+            return cached.body.decode()
+        if check:
+            resp.raise_for_status()
+
+        if self.cache and resp.ok:
+            page = CachedPage(
+                resp.content,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+            self.cache.put(year, day, path, page)
         if raw:
             return resp.content.decode()
         return resp.text
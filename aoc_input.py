@@ -0,0 +1,182 @@
+"""
+Shared functions for loading the daily puzzle inputs.
+
+Input files are memory-mapped and split into lines a chunk at a time, so the
+lines can be consumed lazily, without first reading the whole file into one
+string.  In binary mode the lines are returned as bytes, for parsers that can
+skip decoding.
+"""
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+from pathlib import Path
+from itertools import chain
+import mmap
+import os
+
+Line = Union[str, bytes]
+Lines = Sequence[str]
+Sections = Sequence[Lines]
+
+# Size of the pieces in which a mapped file is split into lines.
+CHUNK_SIZE = 1 << 20
+
+
+def clean_lines(
+    raw_lines: Iterable[Line],
+    strip: bool = True,
+    blank_lines: bool = False,
+) -> Iterator[Line]:
+    """Yield the given lines, stripped of whitespace if strip is true.
+
+    Blank lines are dropped unless blank_lines is true.  Even then, the empty
+    lines at the start and end of the input are dropped, just as if the
+    newlines had been stripped from the input text before splitting it.
+    """
+    pending = 0
+    started = False
+    for line in raw_lines:
+        if not line:
+            pending += started
+            continue
+        if strip:
+            line = line.strip()
+        if blank_lines:
+            empty = line[:0]
+            for _ in range(pending):
+                yield empty
+            pending = 0
+            started = True
+            yield line
+        elif line if strip else line.strip():
+            yield line
+
+def clean_batches(
+    batches: Iterable[Iterable[Line]],
+    strip: bool = True,
+    blank_lines: bool = False,
+) -> Iterator[List[Line]]:
+    """Like clean_lines(), but for a sequence of batches of lines.
+
+    Whole batches are filtered at once when blank lines are dropped, which
+    is much faster than handling one line at a time.
+    """
+    if not blank_lines:
+        for batch in batches:
+            if strip:
+                yield list(filter(None, [line.strip() for line in batch]))
+            else:
+                yield [line for line in batch if line.strip()]
+        return
+
+    pending = 0
+    started = False
+    for batch in batches:
+        result = []
+        for line in batch:
+            if not line:
+                pending += started
+                continue
+            if strip:
+                line = line.strip()
+            if pending:
+                result.extend([line[:0]] * pending)
+                pending = 0
+            started = True
+            result.append(line)
+        yield result
+
+def mapped_batches(
+    infile: Union[str, Path],
+    binary: bool = False,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[List[Line]]:
+    """Yield the raw lines of a file, without their newlines, in batches.
+
+    The file is memory-mapped, and only one chunk of it is split at a time.
+    Only the bytes from start up to end are read; start should be at the
+    beginning of a line.  Windows line endings are handled like plain
+    newlines, as they are by Path.read_text().
+    """
+    with open(infile, "rb") as fp:
+        if not os.fstat(fp.fileno()).st_size:
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm) if end is None else min(end, len(mm))
+            while start < size:
+                stop = mm.rfind(b"\n", start, min(start + CHUNK_SIZE, size))
+                if stop < 0:
+                    stop = mm.find(b"\n", start + CHUNK_SIZE, size)
+                    if stop < 0:
+                        stop = size
+                chunk = mm[start:stop]
+                if b"\r" in chunk:
+                    chunk = chunk.replace(b"\r\n", b"\n")
+                    if chunk.endswith(b"\r"):
+                        chunk = chunk[:-1]
+                if binary:
+                    yield chunk.split(b"\n")
+                else:
+                    yield chunk.decode().split("\n")
+                start = stop + 1
+
+def iter_lines(
+    infile: Union[str, Path],
+    strip: bool = True,
+    blank_lines: bool = False,
+    binary: bool = False,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[Line]:
+    """Return a lazy iterator over the lines of an input file, or of the
+    byte range from start to end.
+    """
+    batches = mapped_batches(infile, binary=binary, start=start, end=end)
+    return chain.from_iterable(clean_batches(batches, strip=strip, blank_lines=blank_lines))
+
+def load_input(
+    infile: Union[str, Path],
+    strip: bool = True,
+    blank_lines: bool = False,
+    binary: bool = False,
+) -> List[Line]:
+    """Return the lines of an input file as a list."""
+    lines = []
+    batches = mapped_batches(infile, binary=binary)
+    for batch in clean_batches(batches, strip=strip, blank_lines=blank_lines):
+        lines.extend(batch)
+    return lines
+
+def load_text(
+    text: Union[str, bytes],
+    strip: bool = True,
+    blank_lines: bool = False,
+) -> List[Line]:
+    """Return the lines of the given text as a list."""
+    newline = b"\n" if isinstance(text, bytes) else "\n"
+    return list(clean_lines(text.split(newline), strip=strip, blank_lines=blank_lines))
+
+def iter_sections(lines: Union[str, bytes, Iterable[Line]]) -> Iterator[List[Line]]:
+    """Yield the sections of the input, which are separated by blank lines.
+
+    The lines may be any iterable, such as the lazy iterator returned by
+    iter_lines(), or the input may be given as plain text.  Each section is
+    yielded as soon as the blank line that ends it has been read.
+    """
+    if isinstance(lines, str):
+        lines = lines.split("\n")
+    elif isinstance(lines, bytes):
+        lines = lines.split(b"\n")
+    sect = []
+    for line in lines:
+        if not line.strip():
+            if sect:
+                yield sect
+            sect = []
+        else:
+            sect.append(line)
+    if sect:
+        yield sect
+
+def parse_sections(lines: Union[str, bytes, Iterable[Line]]) -> List[List[Line]]:
+    """Split the input into sections separated by blank lines."""
+    return list(iter_sections(lines))
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Benchmark the daily solutions, and compare the timings with a stored baseline.
+
+Each day's solve() and solve2() are run on the day's sample cases and on its
+input.txt.  Every case is timed a few times after a warm-up, each time in a
+loop long enough for the clock to be accurate, and the best and median time
+per call are recorded.  With --save the timings are written to the baseline
+file; with --compare any case whose best time has become slower than the
+baseline by more than the threshold, and by more than the noise floor, is
+reported as a regression.
+
+With --memory, each case is also run once under tracemalloc, and its peak
+memory and top allocation sites are recorded too.  Peak memory is compared
+with the baseline just like the time.
+
+With --import-time, the time taken to import the given modules in a fresh
+interpreter is measured instead, using python -X importtime.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from pathlib import Path
+from dataclasses import dataclass, field
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import run
+
+
+BASELINE_FILENAME = "bench_baseline.json"
+
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+DEFAULT_THRESHOLD = 10.0
+
+# Slowdowns smaller than this many seconds per call are treated as noise.
+DEFAULT_NOISE_FLOOR = 0.001
+
+# Results that print shorter than this are shown by timed().
+MAX_SHOWN = 80
+
+SAMPLE_CASES = {1: "SAMPLE_CASES", 2: "SAMPLE_CASES2"}
+
+# Days that define a single sample as SAMPLE/EXPECTED rather than SAMPLE_CASES.
+SINGLE_SAMPLES = {1: ("SAMPLE", "EXPECTED"), 2: ("SAMPLE2", "EXPECTED2")}
+
+
+logging.basicConfig(format="%(message)s", stream=sys.stdout, level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Timing:
+    """The timing of one benchmark case, and optionally its memory use."""
+    median: float
+    best: float
+    runs: int
+    peak_memory: Optional[int] = None
+    top_allocations: List[Tuple[str, int]] = field(default_factory=list)
+
+    def to_json(self) -> Dict[str, Any]:
+        data = {"median": self.median, "best": self.best, "runs": self.runs}
+        if self.peak_memory is not None:
+            data["peak_memory"] = self.peak_memory
+            data["top_allocations"] = [list(site) for site in self.top_allocations]
+        return data
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Timing":
+        return cls(
+            median=data["median"],
+            best=data["best"],
+            runs=data["runs"],
+            peak_memory=data.get("peak_memory"),
+            top_allocations=[tuple(site) for site in data.get("top_allocations", [])],
+        )
+
+
+@dataclass
+class Regression:
+    """A benchmark case that is slower, or uses more memory, than its baseline."""
+    case: str
+    baseline: float
+    current: float
+    metric: str = "time"
+
+    @property
+    def change(self) -> float:
+        """The change in the metric, as a percentage of the baseline."""
+        return 100.0 * (self.current - self.baseline) / self.baseline
+
+    def describe(self) -> str:
+        if self.metric == "memory":
+            before, after = run.format_size(self.baseline), run.format_size(self.current)
+            label = "MORE MEMORY"
+        else:
+            before, after = f"{self.baseline:.6f} s", f"{self.current:.6f} s"
+            label = "SLOWER"
+        return f"{label}: {self.case}: {before} -> {after} ({self.change:+.1f}%)"
+
+
+# Benchmark cases
+
+def case_name(day: int, part: int, label: str) -> str:
+    return f"day{day}.part{part}.{label}"
+
+def sample_cases(day: int, part: int) -> List[Tuple[Any, Any]]:
+    module = run.load_day(day)
+    if hasattr(module, SAMPLE_CASES[part]):
+        return list(getattr(module, SAMPLE_CASES[part]))
+    sample, expected = SINGLE_SAMPLES[part]
+    if hasattr(module, sample):
+        return [(getattr(module, sample), getattr(module, expected, None))]
+    return []
+
+def sample_args(day: int, part: int, sample: Any) -> tuple:
+    """Return the solver arguments for a sample case.
+
+    Most samples are just the input text, but some (like day 15's) are a tuple
+    of the text and the solver's extra arguments.
+    """
+    module = run.load_day(day)
+    if isinstance(sample, tuple):
+        text, *extra = sample
+        lines = module.load_text(text, **run.LOAD_OPTIONS.get(day, {}))
+        return (lines, *extra)
+    lines = module.load_text(sample, **run.LOAD_OPTIONS.get(day, {}))
+    return run.solver_args(day, part, lines)
+
+def benchmark_cases(
+    day: int,
+    part: int,
+    samples: bool = True,
+    inputs: bool = True,
+) -> List[Tuple[str, tuple]]:
+    """Return the (name, solver arguments) of each benchmark case for a day's part."""
+    cases = []
+    if samples:
+        for idx, (sample, _) in enumerate(sample_cases(day, part)):
+            cases.append((case_name(day, part, f"sample{idx}"), sample_args(day, part, sample)))
+    if inputs:
+        args = run.solver_args(day, part, run.load_day_input(day))
+        cases.append((case_name(day, part, "input"), args))
+    return cases
+
+
+# Timing
+
+def time_case(solver, args: tuple, repeat: int, warmup: int, memory: bool = False) -> Timing:
+    """Time calls of the solver, after some untimed warm-up calls.
+
+    Fast cases are called in a loop, sized by timeit's autorange() to take at
+    least 0.2 seconds, and each of the repeat timings is divided by the number
+    of calls.  The loop sizing run counts as the first timing.
+
+    If memory is true, the solver is run once more with its memory traced.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            solver(*args)
+        timer = timeit.Timer(lambda: solver(*args))
+        number, elapsed = timer.autorange()
+        times = [elapsed / number]
+        for _ in range(repeat - 1):
+            times.append(timer.timeit(number) / number)
+        timing = Timing(
+            median=statistics.median(times), best=min(times), runs=number * len(times)
+        )
+        if memory:
+            with run.MemoryTracer() as tracer:
+                solver(*args)
+            timing.peak_memory = tracer.peak
+            timing.top_allocations = tracer.top_allocations
+    return timing
+
+def run_benchmarks(
+    days: Sequence[int],
+    parts: Sequence[int],
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+    samples: bool = True,
+    inputs: bool = True,
+    memory: bool = False,
+) -> Dict[str, Timing]:
+    """Benchmark each case of the selected days and parts.
+
+    Cases whose solver fails are logged and left out of the results.
+    """
+    results = {}
+    for day in days:
+        for part in parts:
+            try:
+                solver = getattr(run.load_day(day), run.SOLVERS[part])
+                cases = benchmark_cases(day, part, samples=samples, inputs=inputs)
+            except Exception as exc:
+                logger.warning(f"day{day}.part{part}: skipped ({type(exc).__name__}: {exc})")
+                continue
+            for name, args in cases:
+                try:
+                    results[name] = time_case(solver, args, repeat, warmup, memory=memory)
+                except Exception as exc:
+                    logger.warning(f"{name}: skipped ({type(exc).__name__}: {exc})")
+                    continue
+                peak = results[name].peak_memory
+                peak_text = f" {run.format_size(peak):>10}" if peak is not None else ""
+                logger.info(f"{name:28} {results[name].best:10.6f} s{peak_text}")
+    return results
+
+def import_time(modules: Sequence[str], repeat: int = DEFAULT_REPEAT) -> Timing:
+    """Time the import of the given modules in fresh interpreters.
+
+    The cumulative times reported by python -X importtime for the top-level
+    imports are added up, so interpreter startup isn't included.
+    """
+    command = [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"]
+    times = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            command, cwd=run.BASE_DIR, capture_output=True, text=True, check=True
+        )
+        total_us = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, name = line.rsplit("|", 2)
+            if name[1:] in modules:
+                total_us += int(cumulative)
+        times.append(total_us / 1e6)
+    return Timing(median=statistics.median(times), best=min(times), runs=len(times))
+
+
+# Baselines
+
+def load_baseline(path: Path) -> Dict[str, Timing]:
+    data = json.loads(path.read_text())
+    return {name: Timing.from_json(timing) for name, timing in data["results"].items()}
+
+def save_baseline(path: Path, results: Dict[str, Timing]) -> None:
+    """Write the timings to the baseline file, keeping entries for cases not re-run."""
+    merged = {}
+    if path.exists():
+        merged.update(load_baseline(path))
+    merged.update(results)
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {name: merged[name].to_json() for name in sorted(merged)},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+def compare(
+    baseline: Dict[str, Timing],
+    current: Dict[str, Timing],
+    threshold: float = DEFAULT_THRESHOLD,
+    noise_floor: float = DEFAULT_NOISE_FLOOR,
+) -> List[Regression]:
+    """Return the cases whose best time or peak memory exceeds the baseline
+    by more than threshold percent.
+
+    A time is only reported if it is also slower by more than noise_floor
+    seconds, so that jitter in cases taking microseconds isn't reported.
+    """
+    regressions = []
+    for name, timing in current.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        candidates = []
+        if before.best > 0 and timing.best - before.best > noise_floor:
+            candidates.append(Regression(name, before.best, timing.best))
+        if before.peak_memory and timing.peak_memory is not None:
+            candidates.append(
+                Regression(name, before.peak_memory, timing.peak_memory, metric="memory")
+            )
+        regressions.extend(r for r in candidates if r.change > threshold)
+    return regressions
+
+
+# Helpers for the dayN/bench_dayN.py scripts
+
+def timed(label: str, func: Callable, *args) -> Tuple[Any, float]:
+    """Run func(*args) once, and log how long it took.
+
+    Short results, such as answers, are logged too.  Return the result and
+    the elapsed time.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    shown = ""
+    if isinstance(result, (int, str)) or (isinstance(result, (tuple, list)) and len(result) < 10):
+        text = str(result)
+        if len(text) < MAX_SHOWN:
+            shown = f"  -> {text}"
+    logger.info(f"{label:32} {elapsed:8.3f} s{shown}")
+    return result, elapsed
+
+@contextlib.contextmanager
+def synthetic_input(write: Callable[[Path], None], description: str) -> Iterator[Path]:
+    """Write a synthetic input file in a temporary directory, and yield its
+    path.  The file is removed afterwards.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "input.txt"
+        write(path)
+        logger.info(f"{description}, {path.stat().st_size / 2**20:.1f} MiB")
+        yield path
+
+
+# Command-line interface
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the daily solutions against a stored baseline."
+    )
+    parser.add_argument(
+        "days",
+        nargs="?",
+        default="all",
+        help="The days to benchmark, e.g. '1-5,7' (default: all)",
+    )
+    parser.add_argument(
+        "--part",
+        "-p",
+        type=int,
+        choices=run.PARTS,
+        action="append",
+        help="Benchmark only the given part (may be repeated)",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Number of timings of each case (default {DEFAULT_REPEAT})",
+    )
+    parser.add_argument(
+        "--warmup",
+        "-w",
+        type=int,
+        default=DEFAULT_WARMUP,
+        help=f"Number of untimed runs before timing each case (default {DEFAULT_WARMUP})",
+    )
+    parser.add_argument(
+        "--samples-only",
+        action="store_true",
+        help="Benchmark only the sample cases, not input.txt",
+    )
+    parser.add_argument(
+        "--baseline",
+        "-b",
+        default=str(run.BASE_DIR / BASELINE_FILENAME),
+        help="The baseline file",
+    )
+    parser.add_argument(
+        "--memory",
+        "-m",
+        action="store_true",
+        help="Also record each case's peak memory and top allocation sites",
+    )
+    parser.add_argument(
+        "--import-time",
+        "-i",
+        action="append",
+        metavar="MODULES",
+        help="Time the import of a comma-separated list of modules (may be repeated)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--save",
+        action="store_true",
+        help="Save the timings to the baseline file",
+    )
+    mode.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare the timings with the baseline file",
+    )
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Percent slowdown reported as a regression (default {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--noise-floor",
+        type=float,
+        default=DEFAULT_NOISE_FLOOR,
+        help=f"Seconds of slowdown per call below which it isn't reported (default {DEFAULT_NOISE_FLOOR})",
+    )
+
+    opt = parser.parse_args(argv)
+    opt.days = run.parse_days(opt.days, run.find_days())
+    opt.parts = sorted(set(opt.part)) if opt.part else list(run.PARTS)
+    if opt.repeat < 1:
+        raise run.UsageError("--repeat must be at least 1")
+    if opt.warmup < 0:
+        raise run.UsageError("--warmup must not be negative")
+    if opt.noise_floor < 0:
+        raise run.UsageError("--noise-floor must not be negative")
+    return opt
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    opt = parse_args(argv)
+    baseline_path = Path(opt.baseline)
+    if opt.compare and not baseline_path.exists():
+        logger.error(f"No baseline file {baseline_path}; create one with --save first")
+        return 2
+
+    if opt.import_time:
+        for spec in opt.import_time:
+            modules = [name.strip() for name in spec.split(",") if name.strip()]
+            timing = import_time(modules, repeat=opt.repeat)
+            logger.info(f"import {', '.join(modules):40} {timing.median * 1000:8.1f} ms")
+        return 0
+
+    results = run_benchmarks(
+        opt.days,
+        opt.parts,
+        repeat=opt.repeat,
+        warmup=opt.warmup,
+        inputs=not opt.samples_only,
+        memory=opt.memory,
+    )
+
+    if opt.save:
+        save_baseline(baseline_path, results)
+        logger.info(f"Wrote {baseline_path}")
+
+    if opt.compare:
+        baseline = load_baseline(baseline_path)
+        regressions = compare(
+            baseline, results, threshold=opt.threshold, noise_floor=opt.noise_floor
+        )
+        for r in regressions:
+            logger.info(r.describe())
+        if regressions:
+            return 1
+        logger.info(f"No regressions over {opt.threshold}%")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
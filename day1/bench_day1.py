@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+#  Benchmark the day 1 solvers on a large synthetic inventory.
+#
+from pathlib import Path
+import argparse
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import bench
+import day1
+
+DEFAULT_LINES = 10**7
+
+
+def make_inventory(path: Path, num_lines: int, seed: int = 2022) -> None:
+    """Write an inventory of about num_lines lines, with 1-15 items per elf."""
+    rng = random.Random(seed)
+    with path.open("w") as fp:
+        written = 0
+        while written < num_lines:
+            items = rng.randint(1, 15)
+            fp.write("\n".join(str(rng.randint(1000, 60000)) for _ in range(items)))
+            fp.write("\n\n")
+            written += items + 1
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the day 1 solvers.")
+    parser.add_argument("--lines", type=int, default=DEFAULT_LINES, help="Size of the inventory")
+    parser.add_argument(
+        "--workers", "-j", type=int, nargs="+", default=[1, 2, 4],
+        help="Numbers of worker processes to try for top_elves_parallel",
+    )
+    opt = parser.parse_args()
+
+    write = lambda path: make_inventory(path, opt.lines)
+    with bench.synthetic_input(write, f"{opt.lines} lines") as infile:
+        lines, load_time = bench.timed("load_input", day1.load_input, str(infile))
+        part1, time1 = bench.timed("solve", day1.solve, lines)
+        part2, time2 = bench.timed("solve2", day1.solve2, lines)
+        del lines
+        _, file_time = bench.timed("top_elves_in_file (k=3)", day1.top_elves_in_file, str(infile), 3)
+        for workers in opt.workers:
+            top, elapsed = bench.timed(
+                f"top_elves_parallel (j={workers})",
+                day1.top_elves_parallel, str(infile), 3, workers,
+            )
+            assert sum(total for total, _ in top) == part2
+            print(f"{'':32} {file_time / elapsed:8.2f}x top_elves_in_file")
+
+        if day1.np is None:
+            print("NumPy is not installed")
+            return
+        text, read_time = bench.timed("read_bytes", infile.read_bytes)
+        part1_np, time1_np = bench.timed("solve_numpy", day1.solve_numpy, text)
+        part2_np, time2_np = bench.timed("solve2_numpy", day1.solve2_numpy, text)
+        assert (part1_np, part2_np) == (part1, part2)
+
+        python_time = load_time + time1 + time2
+        numpy_time = read_time + time1_np + time2_np
+        print(f"speedup (load and both parts): {python_time / numpy_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,26 @@
 #
 #  Advent of Code 2022 - Day 1
 #
-from typing import Sequence, Union, Optional, Any
+from typing import Sequence, Union, Optional, Any, Iterable, Iterator, List, Tuple
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
+from heapq import heappush, heappushpop
+from concurrent.futures import ProcessPoolExecutor
 import math
+import mmap
+import os
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import aoc_input
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is only needed for the *_numpy functions.
+    np = None
 
 INPUTFILE = "input.txt"
 
@@ -62,58 +76,174 @@ Sections = Sequence[Lines]
 # Utility functions
 
 def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
+    return aoc_input.load_input(infile, blank_lines=True)
+
+def load_text(text: str) -> Lines:
+    return aoc_input.load_text(text, blank_lines=True)
 
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-def load_text(text: str) -> Lines:
-    return [line.strip() for line in text.strip("\n").split("\n")]
 
-def parse_sections(lines: Lines) -> Sections:
-    result = []
-    sect = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if sect:
-                result.append(sect)
-            sect = []
-        else:
-            sect.append(line)
-    if sect:
-        result.append(sect)
-    return result
+# Solution
 
+def elf_totals(lines: Iterable[Union[str, bytes]]) -> Iterator[int]:
+    """Yield the total calories carried by each elf, in order.
 
-# Solution
+    The lines are read lazily, and each elf's total is yielded as soon as the
+    blank line after its items is read.
+    """
+    total = None
+    for line in lines:
+        if line.strip():
+            total = int(line) + (total or 0)
+        elif total is not None:
+            yield total
+            total = None
+    if total is not None:
+        yield total
+
+def count_top_elves(
+    lines: Iterable[Union[str, bytes]], k: int = 1
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """Return the number of elves, and the (total, elf) pairs for the k elves
+    carrying the most calories, largest first.
+
+    This takes one pass over the lines, and keeps only a k-sized heap.
+    """
+    heap = []
+    count = 0
+    for count, total in enumerate(elf_totals(lines), 1):
+        if len(heap) < k:
+            heappush(heap, (total, count - 1))
+        else:
+            heappushpop(heap, (total, count - 1))
+    return count, sorted(heap, reverse=True)
+
+def top_elves(lines: Iterable[Union[str, bytes]], k: int = 1) -> List[Tuple[int, int]]:
+    """Return the (total, elf) pairs for the k elves carrying the most calories,
+    largest first.
+    """
+    return count_top_elves(lines, k)[1]
+
+def top_elves_in_file(infile: str, k: int = 1) -> List[Tuple[int, int]]:
+    """Return the top k elves from an inventory file, without loading it."""
+    lines = aoc_input.iter_lines(infile, blank_lines=True, binary=True)
+    return top_elves(lines, k)
+
+# Blank lines (possibly holding whitespace), which separate the elves.
+SEPARATOR_RE = re.compile(rb"\n[ \t\r]*\n")
+
+def segment_ranges(infile: str, num_segments: int) -> List[Tuple[int, int]]:
+    """Split an inventory file into at most num_segments byte ranges of about
+    equal size.
+
+    Each range ends just after a blank line, so that no elf is split across
+    two ranges.
+    """
+    size = os.path.getsize(infile)
+    if not size:
+        return []
+    bounds = [0]
+    with open(infile, "rb") as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for idx in range(1, num_segments):
+                # Back up one byte, in case the target is inside a separator.
+                target = max(size * idx // num_segments - 1, bounds[-1])
+                match = SEPARATOR_RE.search(mm, target)
+                if not match:
+                    break
+                if match.end() > bounds[-1]:
+                    bounds.append(match.end())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+def count_top_elves_in_range(
+    infile: str, start: int, end: int, k: int = 1
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """Return count_top_elves() for the byte range from start to end of a file.
+
+    The elves are numbered from zero within the range.
+    """
+    lines = aoc_input.iter_lines(infile, blank_lines=True, binary=True, start=start, end=end)
+    return count_top_elves(lines, k)
+
+def top_elves_parallel(
+    infile: str, k: int = 1, workers: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """Return the top k elves from an inventory file, like top_elves_in_file(),
+    but split the file into one segment per worker process.
+
+    Each worker finds the top k of its own segment, and their heaps are
+    merged here, after renumbering the elves by the counts of the segments
+    before them.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = segment_ranges(infile, workers)
+    if len(ranges) <= 1:
+        return top_elves_in_file(infile, k)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [
+            executor.submit(count_top_elves_in_range, infile, start, end, k)
+            for start, end in ranges
+        ]
+        heap = []
+        first = 0
+        for future in futures:
+            count, top = future.result()
+            for total, elf in top:
+                if len(heap) < k:
+                    heappush(heap, (total, first + elf))
+                else:
+                    heappushpop(heap, (total, first + elf))
+            first += count
+    return sorted(heap, reverse=True)
+
+def elf_totals_numpy(text: Union[str, bytes]) -> "np.ndarray":
+    """Return an array of the total calories carried by each elf.
+
+    The whole input is parsed into one integer array, with -1 marking the
+    blank lines, and the elves' items are summed with one segmented reduction.
+    """
+    if np is None:
+        raise ImportError("elf_totals_numpy requires NumPy")
+    if isinstance(text, str):
+        text = text.encode()
+    values = np.fromstring(SEPARATOR_RE.sub(b"\n-1\n", text), dtype=np.int64, sep=" ")
+    is_item = values >= 0
+    starts = np.flatnonzero(is_item & ~np.concatenate(([False], is_item[:-1])))
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+    return np.add.reduceat(np.where(is_item, values, 0), starts)
+
+def top_elves_numpy(text: Union[str, bytes], k: int = 1) -> List[Tuple[int, int]]:
+    """Return the (total, elf) pairs for the k elves carrying the most calories,
+    largest first, like top_elves(), but using NumPy.
+    """
+    totals = elf_totals_numpy(text)
+    k = min(k, len(totals))
+    if not k:
+        return []
+    elves = np.argpartition(totals, -k)[-k:]
+    return sorted(((int(totals[elf]), int(elf)) for elf in elves), reverse=True)
+
+def solve2_numpy(text: Union[str, bytes]) -> int:
+    """Solve part 2 from the raw input text, using NumPy."""
+    return sum(total for total, _ in top_elves_numpy(text, 3))
+
+def solve_numpy(text: Union[str, bytes]) -> int:
+    """Solve part 1 from the raw input text, using NumPy."""
+    return top_elves_numpy(text, 1)[0][0]
 
 def solve2(lines: Lines) -> int:
     """Solve the problem."""
-    calories = []
-
-    elves = parse_sections(lines)
-    for elf, cals in enumerate(elves):
-        calories.append((sum(map(int, cals)), elf))
-    calories.sort(reverse=True)
-    return calories[0][0] + calories[1][0] + calories[2][0]
+    return sum(total for total, _ in top_elves(lines, 3))
 
 def solve(lines: Lines) -> int:
     """Solve the problem."""
-    calories = {}
-    best_elf = -1
-    max_cal = -1
-
-    elves = parse_sections(lines)
-    for elf, cals in enumerate(elves):
-        calories[elf] = sum(map(int, cals))
-        if calories[elf] > max_cal:
-            best_elf = elf
-            max_cal = calories[elf]
-
-    return max_cal
+    return top_elves(lines, 1)[0][0]
 
 
 # PART 1
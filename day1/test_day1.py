@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from day1 import SAMPLE_CASES, load_text, elf_totals, top_elves, top_elves_in_file
+from day1 import segment_ranges, top_elves_parallel
+from day1 import solve, solve2, elf_totals_numpy, top_elves_numpy, solve_numpy, solve2_numpy
+
+
+LINES = load_text(SAMPLE_CASES[0][0])
+
+def test_elf_totals():
+    assert list(elf_totals(LINES)) == [6000, 4000, 11000, 24000, 10000]
+
+def test_top_elves():
+    assert top_elves(LINES, 1) == [(24000, 3)]
+    assert top_elves(LINES, 3) == [(24000, 3), (11000, 2), (10000, 4)]
+    assert len(top_elves(LINES, 10)) == 5
+
+def test_top_elves_is_streaming():
+    def lines():
+        yield from ["1", "2", "", "5"]
+
+    assert top_elves(lines(), 2) == [(5, 1), (3, 0)]
+
+def test_top_elves_in_file(tmp_path):
+    infile = tmp_path / "input.txt"
+    infile.write_text("\n".join(LINES) + "\n")
+    assert top_elves_in_file(str(infile), 3) == top_elves(LINES, 3)
+
+def test_segment_ranges_split_at_blank_lines(tmp_path):
+    infile = tmp_path / "input.txt"
+    text = "\n".join(LINES) + "\n"
+    infile.write_text(text)
+    ranges = segment_ranges(str(infile), 4)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(text)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and text[start - 2:start] == "\n\n"
+    assert len(segment_ranges(str(infile), 100)) == 5
+
+def test_top_elves_parallel(tmp_path):
+    infile = tmp_path / "input.txt"
+    infile.write_text("\n".join(LINES * 3) + "\n")
+    expected = top_elves_in_file(str(infile), 4)
+    for workers in (1, 2, 4, 20):
+        assert top_elves_parallel(str(infile), 4, workers) == expected
+
+def test_numpy_matches_pure_python():
+    pytest.importorskip("numpy")
+    text = SAMPLE_CASES[0][0] + "\n  \n\n7\n"
+    lines = load_text(text)
+    assert list(elf_totals_numpy(text)) == list(elf_totals(lines))
+    assert solve_numpy(text) == solve(lines)
+    assert solve2_numpy(text) == solve2(lines)
+    assert [total for total, _ in top_elves_numpy(text, 10)] == [
+        total for total, _ in top_elves(lines, 10)
+    ]
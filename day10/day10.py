@@ -8,6 +8,10 @@ from collections import defaultdict
 from dataclasses import dataclass
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text
 
 from device import Device, Instruction, Opcode
 
@@ -353,20 +357,11 @@ Sections = Sequence[Lines]
 
 # Utility functions
 
-def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
 def sample_case(idx: int = 0) -> Tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-def load_text(text: str) -> Lines:
-    return filter_blank_lines(text.split("\n"))
-
-def filter_blank_lines(lines: Lines) -> Lines:
-    return [line.strip() for line in lines if line.strip()]
-
 # Solution
 
 def solve2(lines: Lines) -> int:
@@ -8,6 +8,11 @@ from collections import defaultdict
 from dataclasses import dataclass
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import aoc_input
+from aoc_input import parse_sections
 
 INPUTFILE = "input.txt"
 
@@ -88,26 +93,10 @@ Sections = Sequence[Lines]
 # Utility functions
 
 def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
-def load_text(text: str, strip=True) -> Lines:
-    if strip:
-        return [line.strip() for line in text.strip("\n").split("\n")]
-    return [line for line in text.strip("\n").split("\n")]
-
-def parse_sections(lines: Lines) -> Sections:
-    result = []
-    sect = []
-    for line in lines:
-        if not line.strip():
-            if sect:
-                result.append(sect)
-            sect = []
-        else:
-            sect.append(line)
-    if sect:
-        result.append(sect)
-    return result
+    return aoc_input.load_input(infile, blank_lines=True)
+
+def load_text(text: str) -> Lines:
+    return aoc_input.load_text(text, blank_lines=True)
 
 
 # Solution
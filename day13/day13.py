@@ -6,6 +6,10 @@ from typing import Sequence, Union, Optional, Any, Dict, List, Tuple
 from pathlib import Path
 import json
 from functools import cmp_to_key
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text, parse_sections, iter_sections
 
 INPUTFILE = "input.txt"
 
@@ -75,35 +79,6 @@ SAMPLE_CASES2 = [
 Lines = Sequence[str]
 Sections = Sequence[Lines]
 
-# Utility functions
-
-def load_input(infile: str, **kwargs) -> Lines:
-    return load_text(Path(infile).read_text(), **kwargs)
-
-def load_text(text: str, strip=True, blank_lines=False) -> Lines:
-    if strip:
-        lines = [line.strip() for line in text.strip("\n").split("\n")]
-    else:
-        lines = [line for line in text.strip("\n").split("\n")]
-    if blank_lines:
-        return lines
-    return [line for line in lines if line.strip()]
-
-def parse_sections(lines: Lines) -> Sections:
-    result = []
-    sect = []
-    for line in lines:
-        if not line.strip():
-            if sect:
-                result.append(sect)
-            sect = []
-        else:
-            sect.append(line)
-    if sect:
-        result.append(sect)
-    return result
-
-
 # Solution
 
 def parse_pair(lines) -> Tuple[List[Any], List[Any]]:
@@ -155,14 +130,10 @@ def solve2(lines: Lines) -> int:
 
 def solve(lines: Lines) -> int:
     """Solve the problem."""
-    sects = parse_sections(lines)
-    pairs = []
-    for sect in sects:
-        pairs.append(parse_pair(sect))
-
     ordered_pairs = []
-    for idx, (left, right) in enumerate(pairs):
+    for idx, sect in enumerate(iter_sections(lines)):
         number = idx + 1
+        left, right = parse_pair(sect)
         # print(f"\nPair {number}:")
         # print(f"left:  {left}")
         # print(f"right: {right}")
@@ -11,6 +11,10 @@ from itertools import combinations
 from pprint import pprint
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text
 
 INPUTFILE = "input.txt"
 
@@ -54,38 +58,6 @@ Valve JJ has flow rate=21; tunnel leads to valve II
 Lines = Sequence[str]
 Sections = Sequence[Lines]
 
-# Utility functions
-
-
-def load_input(infile: str, strip=True, blank_lines=False) -> Lines:
-    return load_text(Path(infile).read_text())
-
-
-def load_text(text: str, strip=True, blank_lines=False) -> Lines:
-    if strip:
-        lines = [line.strip() for line in text.strip("\n").split("\n")]
-    else:
-        lines = [line for line in text.strip("\n").split("\n")]
-    if blank_lines:
-        return lines
-    return [line for line in lines if line.strip()]
-
-
-def parse_sections(lines: Lines) -> Sections:
-    result = []
-    sect = []
-    for line in lines:
-        if not line.strip():
-            if sect:
-                result.append(sect)
-            sect = []
-        else:
-            sect.append(line)
-    if sect:
-        result.append(sect)
-    return result
-
-
 # Solution
 
 LINE_RE = re.compile(
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+#
+#  Benchmark the day 2 scorers on a large synthetic strategy guide.
+#
+from pathlib import Path
+import argparse
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import bench
+import day2
+
+DEFAULT_ROUNDS = 10**7
+
+
+def make_guide(path: Path, num_rounds: int, seed: int = 2022) -> None:
+    """Write a strategy guide of num_rounds random rounds."""
+    rng = random.Random(seed)
+    block = 10**5
+    with path.open("w") as fp:
+        for start in range(0, num_rounds, block):
+            count = min(block, num_rounds - start)
+            fp.write("\n".join(rng.choices(day2.ROUNDS, k=count)))
+            fp.write("\n")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the day 2 scorers.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Size of the guide")
+    opt = parser.parse_args()
+
+    write = lambda path: make_guide(path, opt.rounds)
+    with bench.synthetic_input(write, f"{opt.rounds} rounds") as infile:
+        lines, load_time = bench.timed("load_input", day2.load_input, str(infile))
+        part1, time1 = bench.timed("dict lookups, part 1", lambda: sum(map(day2.ROUND_SCORE.__getitem__, lines)))
+        part2, time2 = bench.timed("dict lookups, part 2", lambda: sum(map(day2.RESULT_SCORE.__getitem__, lines)))
+        del lines
+        scores, file_time = bench.timed("score_file", day2.score_file, str(infile))
+        assert scores == (part1, part2)
+        print(f"speedup (load and both parts): {(load_time + time1 + time2) / file_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,24 @@
 #
 #  Advent of Code 2022 - Day 2
 #
-from typing import Sequence, Union, Optional, Any
+from typing import Sequence, Union, Optional, Any, List, Tuple
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
 import math
+import mmap
+import os
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text, CHUNK_SIZE
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy, the rounds are counted with bytes.count().
+    np = None
 
 INPUTFILE = "input.txt"
 
@@ -38,22 +50,11 @@ Sections = Sequence[Lines]
 
 # Utility functions
 
-def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-## Use these if blank lines should be discarded.
-
-def load_text(text: str) -> Lines:
-    return filter_blank_lines(text.split("\n"))
-
-def filter_blank_lines(lines: Lines) -> Lines:
-    return [line.strip() for line in lines if line.strip()]
-
 # Solution
 
 WIN, DRAW, LOSS = 6, 3, 0
@@ -83,20 +84,86 @@ RESULT_SCORE = {
     "C Z": WIN  + ROCK,
 }
 
+# The nine possible rounds, as byte patterns, with their scores in the same
+# order.  Round i is opponent "ABC"[i // 3] against "XYZ"[i % 3].
+ROUNDS = [f"{opponent} {me}" for opponent in "ABC" for me in "XYZ"]
+ROUND_PATTERNS = [rnd.encode() for rnd in ROUNDS]
+ROUND_TABLE = [ROUND_SCORE[rnd] for rnd in ROUNDS]
+RESULT_TABLE = [RESULT_SCORE[rnd] for rnd in ROUNDS]
+
+
+def round_counts(data: bytes) -> List[int]:
+    """Return how many times each of the nine rounds occurs in the data.
+
+    Each pattern is counted with one bytes.count() over the whole buffer,
+    instead of looking up every line in a dict.
+    """
+    return [data.count(pattern) for pattern in ROUND_PATTERNS]
+
+def round_counts_numpy(data: bytes) -> List[int]:
+    """Return round_counts() for the data, in one vectorized pass.
+
+    Every opponent byte followed by a space and one of our bytes starts a
+    round, and the two code bytes give its index in the nine-entry tables.
+    """
+    if np is None:
+        raise ImportError("round_counts_numpy requires NumPy")
+    codes = np.frombuffer(data, dtype=np.uint8)
+    opponent, space, me = codes[:-2], codes[1:-1], codes[2:]
+    starts = np.flatnonzero(
+        (opponent >= ord("A")) & (opponent <= ord("C")) & (space == ord(" "))
+        & (me >= ord("X")) & (me <= ord("Z"))
+    )
+    index = (opponent[starts] - ord("A")) * 3 + (me[starts] - ord("X"))
+    return np.bincount(index, minlength=len(ROUNDS)).tolist()
+
+def count_rounds(data: bytes) -> List[int]:
+    """Return round_counts() for the data, using NumPy if it is available."""
+    if np is None:
+        return round_counts(data)
+    return round_counts_numpy(data)
+
+def score_counts(counts: Sequence[int]) -> Tuple[int, int]:
+    """Return the total scores for parts 1 and 2, given the round counts."""
+    score = sum(count * points for count, points in zip(counts, ROUND_TABLE))
+    score2 = sum(count * points for count, points in zip(counts, RESULT_TABLE))
+    return score, score2
+
+def score_text(text: Union[str, bytes]) -> Tuple[int, int]:
+    """Return the scores for parts 1 and 2 of a strategy guide."""
+    if isinstance(text, str):
+        text = text.encode()
+    return score_counts(count_rounds(text))
+
+def score_file(infile: str) -> Tuple[int, int]:
+    """Return the scores for parts 1 and 2 of a strategy guide file.
+
+    The file is memory-mapped and counted a chunk at a time, with each chunk
+    ending at a newline so that no round is split.
+    """
+    counts = [0] * len(ROUNDS)
+    with open(infile, "rb") as fp:
+        if not os.fstat(fp.fileno()).st_size:
+            return score_counts(counts)
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            start = 0
+            while start < size:
+                stop = size
+                if start + CHUNK_SIZE < size:
+                    stop = mm.rfind(b"\n", start, start + CHUNK_SIZE) + 1 or size
+                for idx, count in enumerate(count_rounds(mm[start:stop])):
+                    counts[idx] += count
+                start = stop
+    return score_counts(counts)
 
 def solve2(lines: Lines) -> int:
     """Solve the problem."""
-    score = 0
-    for line in lines:
-        score += RESULT_SCORE[line]
-    return score
+    return score_text("\n".join(lines))[1]
 
 def solve(lines: Lines) -> int:
     """Solve the problem."""
-    score = 0
-    for line in lines:
-        score += ROUND_SCORE[line]
-    return score
+    return score_text("\n".join(lines))[0]
 
 
 # PART 1
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import pytest
+
+import day2
+from day2 import ROUND_SCORE, RESULT_SCORE, load_text, round_counts, round_counts_numpy
+from day2 import score_file, score_text
+
+
+TEXT = "A Y\nB X\nC Z\nC Z\nA X\nB Z\n"
+
+def test_round_counts():
+    counts = round_counts(TEXT.encode())
+    assert sum(counts) == 6
+    assert counts[8] == 2
+
+def test_round_counts_numpy():
+    pytest.importorskip("numpy")
+    data = TEXT.encode() + b"A  X\nB Y\r\n"
+    assert round_counts_numpy(data) == round_counts(data)
+
+def test_score_text_matches_dict_lookups():
+    lines = load_text(TEXT)
+    assert score_text(TEXT) == (
+        sum(ROUND_SCORE[line] for line in lines),
+        sum(RESULT_SCORE[line] for line in lines),
+    )
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+def test_score_file(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(day2, "CHUNK_SIZE", chunk_size)
+    infile = tmp_path / "input.txt"
+    infile.write_text(TEXT * 10)
+    assert score_file(str(infile)) == tuple(10 * score for score in score_text(TEXT))
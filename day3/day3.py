@@ -2,12 +2,24 @@
 #
 #  Advent of Code 2022 - Day 3
 #
-from typing import Sequence, Union, Optional, Any
+from typing import Sequence, Union, Optional, Any, Iterable, Iterator, Tuple
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import reduce
+from operator import and_
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy, score_buffer() builds the masks one rucksack at a time.
+    np = None
 
 INPUTFILE = "input.txt"
 
@@ -44,34 +56,14 @@ Sections = Sequence[Lines]
 
 # Utility functions
 
-def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-## Use these if blank lines should be discarded.
-
-def load_text(text: str) -> Lines:
-    return filter_blank_lines(text.split("\n"))
-
-def filter_blank_lines(lines: Lines) -> Lines:
-    return [line.strip() for line in lines if line.strip()]
-
 # Solution
 
-def solve2(lines: Lines) -> int:
-    """Solve the problem."""
-    assert len(lines) % 3 == 0
-    total = 0
-    ngroups = len(lines) // 3
-    for i in range(ngroups):
-        items = common_items(lines[i*3:(i+1)*3])
-        assert len(items) == 1
-        total += priority(items[0])
-    return total
+ITEM_TYPES = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
 def priority(item):
     result = ord(item) - ord('a')
@@ -79,25 +71,124 @@ def priority(item):
         return result + 1
     return ord(item) - ord('A') + 27
 
+# The bit for each item type, keyed by both the character and its byte
+# value.  Items of priority p are at bit p - 1, so that the priority of a
+# single-item mask is its bit_length().
+ITEM_BIT = {}
+for _item in ITEM_TYPES:
+    ITEM_BIT[_item] = ITEM_BIT[ord(_item)] = 1 << (priority(_item) - 1)
+
+if np is not None:
+    ITEM_BITS_NUMPY = np.zeros(256, dtype=np.uint64)
+    for _item in ITEM_TYPES:
+        ITEM_BITS_NUMPY[ord(_item)] = ITEM_BIT[_item]
+
+def item_mask(items: Union[str, bytes]) -> int:
+    """Return the 52-bit mask of the item types in a rucksack."""
+    # Each distinct item type adds its own bit once, so the sum is the union.
+    return sum(map(ITEM_BIT.__getitem__, set(items)))
+
+def mask_priority(mask: int) -> int:
+    """Return the priority of the one item type in a mask."""
+    assert mask and not mask & (mask - 1), f"expected one common item, got {mask:#x}"
+    return mask.bit_length()
+
 def split_line(line):
     size = len(line)
     assert size % 2 == 0
     return [line[:size//2], line[size//2:]]
 
-def common_items(lines):
-    common = set(lines[0])
-    for line in lines[1:]:
-        common = common & set(line)
-    return list(common)
+def common_mask(lines: Iterable[Union[str, bytes]]) -> int:
+    """Return the mask of the item types common to all the given rucksacks."""
+    return reduce(and_, map(item_mask, lines))
+
+def group_priorities(lines: Lines, group_size: int = 3) -> Iterator[int]:
+    """Yield the priority of the badge of each group of group_size elves."""
+    assert len(lines) % group_size == 0
+    masks = list(map(item_mask, lines))
+    for i in range(0, len(masks), group_size):
+        yield mask_priority(reduce(and_, masks[i:i+group_size]))
+
+def score_buffer(data: Union[str, bytes], group_size: int = 3) -> Tuple[int, int]:
+    """Return the answers to parts 1 and 2 for a whole input buffer.
+
+    Each rucksack's two halves are masked once; their intersection scores
+    part 1 and their union is reused for the group badges of part 2.
+    This uses score_buffer_numpy() if NumPy is available.
+    """
+    if np is not None:
+        return score_buffer_numpy(data, group_size)
+    lines = data.split()
+    assert len(lines) % group_size == 0
+    total = total2 = 0
+    badge = -1
+    for count, line in enumerate(lines, 1):
+        first, second = split_line(line)
+        first, second = item_mask(first), item_mask(second)
+        total += mask_priority(first & second)
+        badge &= first | second
+        if count % group_size == 0:
+            total2 += mask_priority(badge)
+            badge = -1
+    return total, total2
+
+def rucksack_masks_numpy(data: Union[str, bytes]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return arrays of the masks of the first and second halves of each
+    rucksack in the data.
+
+    Every item byte is mapped to its bit through a 256-entry table, and the
+    bits of each half-rucksack are combined with one segmented bitwise_or.
+    """
+    if np is None:
+        raise ImportError("rucksack_masks_numpy requires NumPy")
+    if isinstance(data, str):
+        data = data.encode()
+    # Normalize the line endings, and drop blank lines.
+    data = b"\n".join(data.split())
+    if not data:
+        empty = np.zeros(0, dtype=np.uint64)
+        return empty, empty
+    codes = np.frombuffer(data, dtype=np.uint8)
+    bits = ITEM_BITS_NUMPY[codes]
+    ends = np.append(np.flatnonzero(codes == ord("\n")), len(codes))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    sizes = ends - starts
+    assert not (sizes % 2).any()
+    halves = np.stack((starts, starts + sizes // 2), axis=1).ravel()
+    masks = np.bitwise_or.reduceat(bits, halves)
+    return masks[0::2], masks[1::2]
+
+def badge_masks_numpy(first: "np.ndarray", second: "np.ndarray", group_size: int = 3) -> "np.ndarray":
+    """Return the mask of the items common to each group of group_size elves."""
+    assert len(first) % group_size == 0
+    return np.bitwise_and.reduce((first | second).reshape(-1, group_size), axis=1)
+
+def score_buffer_numpy(data: Union[str, bytes], group_size: int = 3) -> Tuple[int, int]:
+    """Return score_buffer() for the data, with the masks built by NumPy."""
+    first, second = rucksack_masks_numpy(data)
+    badges = badge_masks_numpy(first, second, group_size)
+    return mask_priorities(first & second), mask_priorities(badges)
+
+def mask_priorities(masks: "np.ndarray") -> int:
+    """Return the total priority of an array of single-item masks."""
+    assert (masks != 0).all() and not (masks & (masks - 1)).any()
+    # Each mask is a power of two, which float64 holds exactly, and frexp()
+    # gives its bit_length() as the exponent.
+    return int(np.frexp(masks.astype(np.float64))[1].sum())
+
+def solve2(lines: Lines, group_size: int = 3) -> int:
+    """Solve the problem."""
+    if np is not None:
+        first, second = rucksack_masks_numpy("\n".join(lines))
+        return mask_priorities(badge_masks_numpy(first, second, group_size))
+    return sum(group_priorities(lines, group_size))
 
 def solve(lines: Lines) -> int:
     """Solve the problem."""
-    total = 0
-    for line in lines:
-        items = common_items(split_line(line))
-        assert len(items) == 1
-        total += priority(items[0])
-    return total
+    if np is not None:
+        first, second = rucksack_masks_numpy("\n".join(lines))
+        return mask_priorities(first & second)
+    return sum(mask_priority(common_mask(split_line(line))) for line in lines)
 
 
 # PART 1
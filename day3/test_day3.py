@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from day3 import SAMPLE_CASES, load_text, item_mask, mask_priority, priority
+from day3 import group_priorities, score_buffer, score_buffer_numpy, solve, solve2
+import day3
+
+
+TEXT = SAMPLE_CASES[0][0]
+LINES = load_text(TEXT)
+
+def test_item_mask():
+    assert item_mask("aAa") == item_mask(b"Aa") == 1 | 1 << 26
+    assert mask_priority(item_mask("p")) == priority("p") == 16
+    assert mask_priority(item_mask("Z")) == 52
+
+def test_group_sizes():
+    assert list(group_priorities(LINES)) == [18, 52]
+    assert list(group_priorities(LINES[:3] + ["rr"], 4)) == [priority("r")]
+    assert list(group_priorities(["ab", "bc", "cd", "de"], 2)) == [2, 4]
+
+def test_score_buffer():
+    assert score_buffer(TEXT) == (solve(LINES), solve2(LINES)) == (157, 70)
+    lines = LINES[:3] + ["rr"]
+    assert score_buffer(b"\n".join(line.encode() for line in lines), 4) == (
+        solve(lines), solve2(lines, 4)
+    )
+
+def test_score_buffer_without_numpy(monkeypatch):
+    monkeypatch.setattr(day3, "np", None)
+    assert (solve(LINES), solve2(LINES)) == score_buffer(TEXT) == (157, 70)
+    assert score_buffer(TEXT.encode() + b"rr\r\nrr\r\nrr\r\n") == (157 + 3 * 18, 88)
+
+def test_score_buffer_numpy():
+    pytest.importorskip("numpy")
+    data = TEXT.encode() + b"rr\r\nrr\r\nrr\r\n"
+    assert score_buffer_numpy(data) == (157 + 3 * 18, 88)
+    assert score_buffer_numpy(b"") == (0, 0)
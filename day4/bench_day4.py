@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+#
+#  Benchmark the day 4 counters on a large synthetic list of assignments.
+#
+from pathlib import Path
+import argparse
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import bench
+import day4
+
+DEFAULT_PAIRS = 10**7
+DEFAULT_QUERIES = 1000
+
+
+def make_assignments(path: Path, num_pairs: int, seed: int = 2022) -> None:
+    """Write num_pairs random pairs of section ranges between 1 and 99."""
+    rng = random.Random(seed)
+    block = 10**5
+    with path.open("w") as fp:
+        for start in range(0, num_pairs, block):
+            lines = []
+            for _ in range(min(block, num_pairs - start)):
+                a0, a1 = sorted(rng.choices(range(1, 100), k=2))
+                b0, b1 = sorted(rng.choices(range(1, 100), k=2))
+                lines.append(f"{a0}-{a1},{b0}-{b1}\n")
+            fp.write("".join(lines))
+
+def count_per_line(lines) -> tuple:
+    """Count the pairs one line at a time, with parse_line()."""
+    contained = overlapping = 0
+    for line in lines:
+        (a0, a1), (b0, b1) = day4.parse_line(line)
+        contained += (a0 <= b0 and b1 <= a1) or (b0 <= a0 and a1 <= b1)
+        overlapping += a0 <= b1 and b0 <= a1
+    return contained, overlapping
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the day 4 counters.")
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS, help="Number of pairs")
+    parser.add_argument(
+        "--queries", type=int, default=DEFAULT_QUERIES,
+        help="Number of stabbing and overlap queries to run on the interval index",
+    )
+    opt = parser.parse_args()
+
+    write = lambda path: make_assignments(path, opt.pairs)
+    with bench.synthetic_input(write, f"{opt.pairs} pairs") as infile:
+        lines, load_time = bench.timed("load_input", day4.load_input, str(infile))
+        counts, line_time = bench.timed("parse_line, both parts", count_per_line, lines)
+        del lines
+
+        text, read_time = bench.timed("read_bytes", infile.read_bytes)
+        columns, parse_time = bench.timed("parse_columns", day4.parse_columns, text)
+        counts2, count_time = bench.timed("count_pairs", day4.count_pairs, columns)
+        assert counts2 == counts
+        speedup = (load_time + line_time) / (read_time + parse_time + count_time)
+        print(f"speedup (load and both parts): {speedup:.1f}x")
+
+        index, _ = bench.timed("IntervalIndex.from_columns", day4.IntervalIndex.from_columns, columns)
+        counts3, _ = bench.timed("IntervalIndex.count_pairs", index.count_pairs)
+        assert counts3 == counts
+        rng = random.Random(4)
+        points = [rng.randint(1, 99) for _ in range(opt.queries)]
+        found, elapsed = bench.timed("stab", lambda: sum(len(index.stab(point)) for point in points))
+        print(f"{'':32} {elapsed / opt.queries * 1e3:8.3f} ms per query, {found / opt.queries:.0f} found")
+        ranges = [(point, point + rng.randint(0, 3)) for point in points]
+        found, elapsed = bench.timed("overlapping", lambda: sum(len(index.overlapping(*bounds)) for bounds in ranges))
+        print(f"{'':32} {elapsed / opt.queries * 1e3:8.3f} ms per query, {found / opt.queries:.0f} found")
+
+
+if __name__ == "__main__":
+    main()
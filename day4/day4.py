@@ -2,12 +2,23 @@
 #
 #  Advent of Code 2022 - Day 4
 #
-from typing import Sequence, Union, Optional, Any
+from typing import Sequence, Union, Optional, Any, List, Tuple
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
+from bisect import bisect_right
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy, count_pairs() compares the columns in a Python loop.
+    np = None
 
 INPUTFILE = "input.txt"
 
@@ -44,52 +55,177 @@ Sections = Sequence[Lines]
 
 # Utility functions
 
-def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-## Use these if blank lines should be discarded.
+# Solution
+
+def parse_line(line):
+    return [list(map(int, part.split("-"))) for part in line.split(",")]
 
-def load_text(text: str) -> Lines:
-    return filter_blank_lines(text.split("\n"))
+NUMBER_RE = re.compile(rb"\d+")
 
-def filter_blank_lines(lines: Lines) -> Lines:
-    return [line.strip() for line in lines if line.strip()]
+# Turns the "-" and "," separators into spaces, for np.fromstring.
+SEPARATORS = bytes.maketrans(b"-,", b"  ")
+
+Columns = Tuple[Sequence[int], Sequence[int], Sequence[int], Sequence[int]]
+
+def parse_columns(text: Union[str, bytes]) -> Columns:
+    """Parse all the assignment pairs into four columns (a0, a1, b0, b1).
+
+    The whole input is parsed in one pass: into NumPy arrays if NumPy is
+    available, and into lists otherwise.
+    """
+    if isinstance(text, str):
+        text = text.encode()
+    if np is not None:
+        values = np.fromstring(text.translate(SEPARATORS), dtype=np.int64, sep=" ")
+    else:
+        values = list(map(int, NUMBER_RE.findall(text)))
+    assert len(values) % 4 == 0
+    return values[0::4], values[1::4], values[2::4], values[3::4]
+
+def count_pairs(columns: Columns) -> Tuple[int, int]:
+    """Return the number of pairs where one range contains the other, and
+    the number of pairs whose ranges overlap.
+    """
+    a0, a1, b0, b1 = columns
+    if np is not None:
+        contained = ((a0 <= b0) & (b1 <= a1)) | ((b0 <= a0) & (a1 <= b1))
+        overlapping = (a0 <= b1) & (b0 <= a1)
+        return int(contained.sum()), int(overlapping.sum())
+    contained = overlapping = 0
+    for start1, end1, start2, end2 in zip(a0, a1, b0, b1):
+        contained += (start1 <= start2 and end2 <= end1) or (start2 <= start1 and end1 <= end2)
+        overlapping += start1 <= end2 and start2 <= end1
+    return contained, overlapping
+
+@dataclass
+class IntervalNode():
+    """A node of a centered interval tree.
+
+    It holds the intervals that contain its center, both in order of their
+    starts and in reverse order of their ends.  The intervals entirely
+    before or after the center are in the left and right subtrees.
+    """
+    center: int
+    starts: List[int]
+    by_start: List[int]
+    neg_ends: List[int]
+    by_end: List[int]
+    left: Optional["IntervalNode"] = None
+    right: Optional["IntervalNode"] = None
+
+
+class IntervalIndex():
+    """A static index of closed intervals, numbered in the order given.
+
+    Stabbing and overlap queries visit O(log n) tree nodes, and report the
+    k matching intervals with a bisect and a slice in each, so they cost
+    about O(log n + k).
+    """
+    def __init__(self, starts: Sequence[int], ends: Sequence[int]):
+        self.starts = list(map(int, starts))
+        self.ends = list(map(int, ends))
+        assert len(self.starts) == len(self.ends)
+        assert all(start <= end for start, end in zip(self.starts, self.ends))
+        self.by_start = sorted(range(len(self.starts)), key=self.starts.__getitem__)
+        self.sorted_starts = [self.starts[idx] for idx in self.by_start]
+        self.root = self._build(self.by_start)
+
+    @classmethod
+    def from_columns(cls, columns: Columns) -> "IntervalIndex":
+        """Index both elves' ranges: pair i gives intervals 2i and 2i + 1."""
+        a0, a1, b0, b1 = (list(map(int, column)) for column in columns)
+        starts = [0] * (2 * len(a0))
+        ends = [0] * (2 * len(a0))
+        starts[0::2], starts[1::2] = a0, b0
+        ends[0::2], ends[1::2] = a1, b1
+        return cls(starts, ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _build(self, ids: List[int]) -> Optional[IntervalNode]:
+        """Build the tree for the given intervals, which are sorted by start."""
+        if not ids:
+            return None
+        starts, ends = self.starts, self.ends
+        center = starts[ids[len(ids) // 2]]
+        left, here, right = [], [], []
+        for idx in ids:
+            if ends[idx] < center:
+                left.append(idx)
+            elif starts[idx] > center:
+                right.append(idx)
+            else:
+                here.append(idx)
+        by_end = sorted(here, key=ends.__getitem__, reverse=True)
+        return IntervalNode(
+            center,
+            [starts[idx] for idx in here],
+            here,
+            [-ends[idx] for idx in by_end],
+            by_end,
+            self._build(left),
+            self._build(right),
+        )
+
+    def stab(self, point: int) -> List[int]:
+        """Return the intervals that contain the point."""
+        result = []
+        node = self.root
+        while node:
+            if point < node.center:
+                result.extend(node.by_start[:bisect_right(node.starts, point)])
+                node = node.left
+            elif point > node.center:
+                result.extend(node.by_end[:bisect_right(node.neg_ends, -point)])
+                node = node.right
+            else:
+                result.extend(node.by_start)
+                break
+        return result
+
+    def overlapping(self, start: int, end: int) -> List[int]:
+        """Return the intervals that overlap the range from start to end."""
+        # Those that contain the start, and then those that start inside.
+        result = self.stab(start)
+        first = bisect_right(self.sorted_starts, start)
+        last = bisect_right(self.sorted_starts, end)
+        result.extend(self.by_start[first:last])
+        return result
+
+    def containing(self, start: int, end: int) -> List[int]:
+        """Return the intervals that contain the whole range from start to end."""
+        return [idx for idx in self.stab(start) if self.ends[idx] >= end]
+
+    def overlaps(self, idx1: int, idx2: int) -> bool:
+        """Return whether two of the indexed intervals overlap."""
+        return self.starts[idx1] <= self.ends[idx2] and self.starts[idx2] <= self.ends[idx1]
+
+    def contains(self, idx1: int, idx2: int) -> bool:
+        """Return whether interval idx1 contains interval idx2."""
+        return self.starts[idx1] <= self.starts[idx2] and self.ends[idx2] <= self.ends[idx1]
+
+    def count_pairs(self) -> Tuple[int, int]:
+        """Return count_pairs() for an index built by from_columns()."""
+        contained = overlapping = 0
+        for idx in range(0, len(self), 2):
+            contained += self.contains(idx, idx + 1) or self.contains(idx + 1, idx)
+            overlapping += self.overlaps(idx, idx + 1)
+        return contained, overlapping
 
-# Solution
 
 def solve2(lines: Lines) -> int:
     """Solve the problem."""
-    total = 0
-    for line in lines:
-        ids1, ids2 = parse_line(line)
-        if ids1[0] > ids2[0]:
-            ids1, ids2 = ids2, ids1
-        # print(f"{ids1} :: {ids2}")
-        if ids2[0] <= ids1[1]:
-            # print("^^^ overlap")
-            total += 1
-    return total
-
-def parse_line(line):
-    return [list(map(int, part.split("-"))) for part in line.split(",")]
+    return count_pairs(parse_columns("\n".join(lines)))[1]
 
 def solve(lines: Lines) -> int:
     """Solve the problem."""
-    total = 0
-    for line in lines:
-        ids1, ids2 = parse_line(line)
-        if ids1[1] - ids1[0] < ids2[1] - ids2[0]:
-            ids1, ids2 = ids2, ids1
-        # print(f"{ids1} :: {ids2}")
-        if ids1[0] <= ids2[0] and ids1[1] >= ids2[1]:
-            # print("^^^ contains")
-            total += 1
-    return total
+    return count_pairs(parse_columns("\n".join(lines)))[0]
 
 
 # PART 1
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import random
+
+import pytest
+
+from day4 import SAMPLE_CASES, load_text, parse_line, parse_columns, count_pairs, IntervalIndex
+import day4
+
+
+TEXT = SAMPLE_CASES[0][0] + "\n1-1,1-1\n5-9,1-4\n"
+
+def expected_counts(text):
+    contained = overlapping = 0
+    for line in load_text(text):
+        (a0, a1), (b0, b1) = parse_line(line)
+        contained += (a0 <= b0 and b1 <= a1) or (b0 <= a0 and a1 <= b1)
+        overlapping += max(a0, b0) <= min(a1, b1)
+    return contained, overlapping
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_count_pairs(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(day4, "np", None)
+    columns = parse_columns(TEXT)
+    assert [list(column) for column in columns] == [
+        [2, 2, 5, 2, 6, 2, 1, 5], [4, 3, 7, 8, 6, 6, 1, 9],
+        [6, 4, 7, 3, 4, 4, 1, 1], [8, 5, 9, 7, 6, 8, 1, 4],
+    ]
+    assert count_pairs(columns) == expected_counts(TEXT) == (3, 5)
+
+def test_interval_index_queries():
+    rng = random.Random(4)
+    starts = [rng.randint(1, 50) for _ in range(300)]
+    ends = [start + rng.randint(0, 20) for start in starts]
+    index = IntervalIndex(starts, ends)
+    intervals = list(enumerate(zip(starts, ends)))
+    for point in range(0, 75):
+        assert sorted(index.stab(point)) == [i for i, (a, b) in intervals if a <= point <= b]
+    for lo, hi in [(0, 0), (5, 9), (20, 20), (30, 60), (71, 90)]:
+        assert sorted(index.overlapping(lo, hi)) == [
+            i for i, (a, b) in intervals if a <= hi and lo <= b
+        ]
+        assert sorted(index.containing(lo, hi)) == [
+            i for i, (a, b) in intervals if a <= lo and hi <= b
+        ]
+    assert IntervalIndex([], []).stab(1) == []
+
+def test_interval_index_pairs():
+    columns = parse_columns(TEXT)
+    index = IntervalIndex.from_columns(columns)
+    assert len(index) == 16
+    assert index.count_pairs() == count_pairs(columns)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+#
+#  Benchmark the day 5 crane on a large synthetic procedure.
+#
+from pathlib import Path
+import argparse
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import bench
+import day5
+
+DEFAULT_MOVES = 10**6
+DEFAULT_STACKS = 9
+DEFAULT_HEIGHT = 20000
+MAX_COUNT = 2000
+
+
+def make_procedure(path: Path, num_moves: int, num_stacks: int, height: int, seed: int = 2022) -> None:
+    """Write num_stacks stacks of the given height, and num_moves valid moves."""
+    rng = random.Random(seed)
+    crates = [rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=height) for _ in range(num_stacks)]
+    lines = [" ".join(f"[{stack[level]}]" for stack in crates) for level in reversed(range(height))]
+    lines.append(" ".join(f" {idx + 1} " for idx in range(num_stacks)))
+    lines.append("")
+    sizes = [height] * num_stacks
+    for _ in range(num_moves):
+        a = rng.choice([idx for idx, size in enumerate(sizes) if size])
+        b = rng.choice([idx for idx in range(num_stacks) if idx != a])
+        count = rng.randint(1, min(sizes[a], MAX_COUNT))
+        sizes[a] -= count
+        sizes[b] += count
+        lines.append(f"move {count} from {a + 1} to {b + 1}")
+    path.write_text("\n".join(lines) + "\n")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the day 5 crane.")
+    parser.add_argument("--moves", type=int, default=DEFAULT_MOVES, help="Number of moves")
+    parser.add_argument("--stacks", type=int, default=DEFAULT_STACKS, help="Number of stacks")
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="Starting stack height")
+    opt = parser.parse_args()
+
+    write = lambda path: make_procedure(path, opt.moves, opt.stacks, opt.height)
+    with bench.synthetic_input(write, f"{opt.moves} moves") as infile:
+        lines, _ = bench.timed("load_input", day5.load_input, str(infile))
+        procedure = day5.parse_sections(lines)[1]
+        bench.timed("parse_instruction", lambda: [day5.parse_instruction(line) for line in procedure])
+        bench.timed("compile_procedure", day5.compile_procedure, procedure)
+        del lines, procedure
+
+        bench.timed("load_program (compile, save)", day5.load_program, str(infile))
+        (stack, program), _ = bench.timed("load_program (cached)", day5.load_program, str(infile))
+        stack2 = [list(crates) for crates in stack]
+        bench.timed("rearrange, CrateMover 9000", day5.rearrange, stack, program, True)
+        bench.timed("rearrange, CrateMover 9001", day5.rearrange, stack2, program, False)
+
+
+if __name__ == "__main__":
+    main()
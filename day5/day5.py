@@ -2,12 +2,20 @@
 #
 #  Advent of Code 2022 - Day 5
 #
-from typing import Sequence, Union, Optional, Any
+from typing import Sequence, Union, Optional, Any, List, Tuple
 from pathlib import Path
+from array import array
 from collections import defaultdict
 from dataclasses import dataclass
+from itertools import chain
+import hashlib
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import aoc_input
+from aoc_input import iter_sections, parse_sections
 
 INPUTFILE = "input.txt"
 
@@ -51,50 +59,22 @@ Sections = Sequence[Lines]
 # Utility functions
 
 def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
+    return aoc_input.load_input(infile, strip=False, blank_lines=True)
+
+def load_text(text: str) -> Lines:
+    return aoc_input.load_text(text, strip=False, blank_lines=True)
 
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-## Use these if blank lines in input are meaningful.
-
-def load_text(text: str) -> Lines:
-    return [line for line in text.strip("\n").split("\n")]
-
-def parse_sections(lines: Lines) -> Sections:
-    result = []
-    sect = []
-    for line in lines:
-        if not line.strip():
-            if sect:
-                result.append(sect)
-            sect = []
-        else:
-            sect.append(line)
-    if sect:
-        result.append(sect)
-    return result
-
 
 # Solution
 
-def solve2(lines: Lines) -> int:
+def solve2(lines: Lines) -> str:
     """Solve the problem."""
-    lines, procedure = parse_sections(lines)
-    stack = parse_stack(lines)
-    step = 0
-    for line in procedure:
-        if not line:
-            continue
-        step += 1
-        # print(f"STEP {step}")
-        # print_stack(stack)
-        count, a, b = parse_instruction(line)
-        move_crates(stack, a-1, b-1, count)
-    result = "".join([crates[-1] for crates in stack if crates])
-    return result
+    return top_crates(lines, one_at_a_time=False)
 
 def parse_stack(lines):
     nstack = (max([len(line) for line in lines]) + 1) // 4
@@ -120,27 +100,85 @@ def move_crate(stack, a, b):
     crate = stack[a].pop(-1)
     stack[b].append(crate)
 
-def move_crates(stack, a, b, count):
-    crates = stack[a][-count:]
-    stack[b].extend(crates)
-    stack[a] = stack[a][:-count]
-
-def solve(lines: Lines) -> int:
-    """Solve the problem."""
+def move_crates(stack, a, b, count, one_at_a_time=False):
+    """Move the top count crates from stack a to stack b.
+
+    With one_at_a_time, the crates end up in reverse order, as if moved by
+    count calls to move_crate().  Either way this takes O(count): the moved
+    crates are copied with one slice and cut from the source with del,
+    without rebuilding the source stack.
+    """
+    if count <= 0:
+        return
+    source = stack[a]
+    if one_at_a_time:
+        stack[b].extend(source[:-count-1:-1])
+    else:
+        stack[b].extend(source[-count:])
+    del source[-count:]
+
+INSTRUCTION_RE = re.compile(r"move (\d+) from (\d+) to (\d+)")
+
+# The compiled procedure is cached next to the input file, with this suffix.
+PROGRAM_SUFFIX = ".procedure"
+
+def compile_procedure(procedure: Union[str, Lines]) -> array:
+    """Compile the procedure into a flat array of (count, from, to) triples,
+    with the stacks numbered as in the text.
+    """
+    text = procedure if isinstance(procedure, str) else "\n".join(procedure)
+    matches = INSTRUCTION_RE.findall(text)
+    assert len(matches) == sum(1 for line in text.split("\n") if line.strip())
+    return array("H", map(int, chain.from_iterable(matches)))
+
+def rearrange(stack, program: array, one_at_a_time: bool) -> str:
+    """Run a compiled procedure on the stacks, and return the top crates."""
+    steps = iter(program)
+    for count, a, b in zip(steps, steps, steps):
+        move_crates(stack, a-1, b-1, count, one_at_a_time)
+    return "".join([crates[-1] for crates in stack if crates])
+
+def top_crates(lines: Lines, one_at_a_time: bool) -> str:
+    """Rearrange the stacks, and return the crates that end up on top."""
     lines, procedure = parse_sections(lines)
-    stack = parse_stack(lines)
-    step = 0
-    for line in procedure:
-        if not line:
-            continue
-        step += 1
-        # print(f"STEP {step}")
-        # print_stack(stack)
-        count, a, b = parse_instruction(line)
-        for _ in range(count):
-            move_crate(stack, a-1, b-1)
-    result = "".join([crates[-1] for crates in stack if crates])
-    return result
+    return rearrange(parse_stack(lines), compile_procedure(procedure), one_at_a_time)
+
+def program_path(infile: str) -> Path:
+    return Path(infile).with_suffix(PROGRAM_SUFFIX)
+
+def load_program(infile: str) -> Tuple[List[List[str]], array]:
+    """Return the starting stacks and the compiled procedure for an input file.
+
+    The compiled procedure is saved next to the input file, after the
+    SHA-256 digest of the input, and reused while the input is unchanged.
+    Then only the drawing of the stacks, the input's first section, is read.
+    """
+    data = Path(infile).read_bytes()
+    digest = hashlib.sha256(data).digest()
+    cache = program_path(infile)
+    try:
+        cached = cache.read_bytes()
+    except FileNotFoundError:
+        cached = b""
+    if cached[:len(digest)] == digest:
+        drawing = next(iter_sections(aoc_input.iter_lines(infile, strip=False, blank_lines=True)))
+        program = array("H")
+        program.frombytes(cached[len(digest):])
+        return parse_stack(drawing), program
+
+    drawing, procedure = parse_sections(load_input(infile))
+    program = compile_procedure(procedure)
+    cache.write_bytes(digest + program.tobytes())
+    return parse_stack(drawing), program
+
+def top_crates_in_file(infile: str, one_at_a_time: bool) -> str:
+    """Return the top crates for an input file, using its cached procedure."""
+    stack, program = load_program(infile)
+    return rearrange(stack, program, one_at_a_time)
+
+def solve(lines: Lines) -> str:
+    """Solve the problem."""
+    return top_crates(lines, one_at_a_time=True)
 
 
 # PART 1
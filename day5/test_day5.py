@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+from array import array
+
+from day5 import SAMPLE_CASES, load_text, parse_sections, solve, solve2
+from day5 import move_crate, move_crates, compile_procedure, load_program, program_path
+from day5 import top_crates_in_file
+
+
+def test_move_crates_keeps_order():
+    stack = [list("ABC"), list("D")]
+    move_crates(stack, 0, 1, 2)
+    assert stack == [["A"], list("DBC")]
+
+def test_move_crates_one_at_a_time():
+    stack = [list("ABC"), list("D")]
+    expected = [list("ABC"), list("D")]
+    for _ in range(3):
+        move_crate(expected, 0, 1)
+    move_crates(stack, 0, 1, 3, one_at_a_time=True)
+    assert stack == expected == [[], list("DCBA")]
+
+def test_move_crates_keeps_the_source_list():
+    stack = [list("ABC"), []]
+    source = stack[0]
+    move_crates(stack, 0, 1, 1)
+    move_crates(stack, 0, 1, 0)
+    assert stack[0] is source and source == list("AB")
+
+def test_compile_procedure():
+    program = compile_procedure(["move 1 from 2 to 1", "", "move 12 from 1 to 3"])
+    assert program == array("H", [1, 2, 1, 12, 1, 3])
+
+def test_load_program_caches_procedure(tmp_path):
+    text = SAMPLE_CASES[0][0].strip("\n").rstrip()
+    infile = tmp_path / "input.txt"
+    infile.write_text(text)
+    lines = load_text(text)
+    expected = (solve(lines), solve2(lines))
+    assert (top_crates_in_file(infile, True), top_crates_in_file(infile, False)) == expected
+    assert program_path(infile).exists()
+
+    stack, program = load_program(infile)
+    assert program == compile_procedure(parse_sections(lines)[1])
+
+    infile.write_text(text + "\nmove 1 from 1 to 2\n")
+    assert len(load_program(infile)[1]) == len(program) + 3
+
+def test_load_program_cached_stacks(tmp_path):
+    text = SAMPLE_CASES[0][0].strip("\n").rstrip().replace("\n\n", "\n  \n")
+    infile = tmp_path / "input.txt"
+    for newline in ("\n", "\r\n"):
+        infile.write_bytes(text.replace("\n", newline).encode())
+        program_path(infile).unlink(missing_ok=True)
+        compiled = load_program(infile)
+        assert load_program(infile) == compiled
+        assert compiled[0] == [list("ZN"), list("MCD"), list("P")]
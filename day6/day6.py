@@ -2,12 +2,17 @@
 #
 #  Advent of Code 2022 - Day 6
 #
-from typing import Sequence, Union, Optional, Any
+from typing import Sequence, Union, Optional, Any, Dict, BinaryIO, Iterable, Iterator, List, Tuple
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import partial
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text, CHUNK_SIZE
 
 INPUTFILE = "input.txt"
 
@@ -62,54 +67,113 @@ Sections = Sequence[Lines]
 
 # Utility functions
 
-def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-## Use these if blank lines should be discarded.
 
-def load_text(text: str) -> Lines:
-    return filter_blank_lines(text.split("\n"))
+# Solution
+
+PACKET_SIZE = 4
+MESSAGE_SIZE = 14
+
+class MarkerScanner():
+    """Search a datastream for markers, as it arrives in chunks.
+
+    A marker of size n is a run of n distinct characters, and it is reported
+    as the number of characters read when it ends.  The position where each
+    byte was last seen is kept in a table, so the start of the longest run
+    of distinct characters ending at each position is known in O(1).  Only
+    that table and the start of the run are kept between chunks, so the
+    memory used does not depend on the length of the stream.
+
+    With first_only, only the first marker of each size is reported, and
+    the scanner is done once all of them have been found.  Otherwise, every
+    position that ends a marker is reported, for each size.
+    """
+    def __init__(self, sizes: Iterable[int], first_only: bool = True):
+        self.pending = sorted(set(sizes))
+        self.first_only = first_only
+        self.last_seen = [-1] * 256
+        self.start = 0
+        self.offset = 0
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def feed(self, chunk: Union[str, bytes]) -> List[Tuple[int, int]]:
+        """Scan the next chunk, and return the (size, end) of its markers."""
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        found = []
+        if not self.pending:
+            return found
+        last_seen, start, pending = self.last_seen, self.start, self.pending
+        for pos, code in enumerate(chunk, self.offset):
+            if last_seen[code] >= start:
+                start = last_seen[code] + 1
+            last_seen[code] = pos
+            run = pos - start + 1
+            if run < pending[0]:
+                continue
+            if self.first_only:
+                while pending and run >= pending[0]:
+                    found.append((pending.pop(0), pos + 1))
+                if not pending:
+                    break
+            else:
+                for size in pending:
+                    if run < size:
+                        break
+                    found.append((size, pos + 1))
+        self.start = start
+        self.offset += len(chunk)
+        return found
+
+def read_chunks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the chunks read from a binary file, or a socket's makefile()."""
+    return iter(partial(stream.read, chunk_size), b"")
+
+def stream_markers(chunks: Iterable[Union[str, bytes]], sizes: Sequence[int]) -> Dict[int, Optional[int]]:
+    """Return the end of the first marker of each size in a chunked stream,
+    or None for the sizes with no marker.
+
+    Reading stops as soon as every marker has been found.
+    """
+    found = dict.fromkeys(sizes)
+    if not found:
+        return found
+    scanner = MarkerScanner(sizes)
+    for chunk in chunks:
+        found.update(scanner.feed(chunk))
+        if scanner.done:
+            break
+    return found
 
-def filter_blank_lines(lines: Lines) -> Lines:
-    return [line.strip() for line in lines if line.strip()]
+def iter_markers(chunks: Iterable[Union[str, bytes]], size: int) -> Iterator[int]:
+    """Yield the end of every marker of the given size in a chunked stream."""
+    scanner = MarkerScanner([size], first_only=False)
+    for chunk in chunks:
+        for _, end in scanner.feed(chunk):
+            yield end
 
+def find_markers(data: Union[str, bytes], sizes: Sequence[int]) -> Dict[int, Optional[int]]:
+    """Find the first marker of each of the given sizes, in one O(n) pass."""
+    return stream_markers([data], sizes)
 
-# Solution
+def marker_end(data: Union[str, bytes], size: int) -> Optional[int]:
+    """Return the end of the first marker of the given size."""
+    return find_markers(data, [size])[size]
 
 def solve2(text: str) -> int:
     """Solve the problem."""
-    i = 0
-    j = 0
-    size = len(text)
-    while j < size:
-        j += 1
-        # print(f"{i}:{j} '{text[i:j+1]}'")
-        ch = text[j]
-        if ch in text[i:j]:
-            i = i + 1 + text[i:j].index(ch)
-        elif j - i == 13:
-            break
-    return j+1
+    return marker_end(text, MESSAGE_SIZE)
 
 def solve(text: str) -> int:
     """Solve the problem."""
-    i = 0
-    j = 0
-    size = len(text)
-    while j < size:
-        j += 1
-        # print(f"{i}:{j} '{text[i:j+1]}'")
-        ch = text[j]
-        if ch in text[i:j]:
-            i = i + 1 + text[i:j].index(ch)
-        elif j - i == 3:
-            break
-    return j+1
+    return marker_end(text, PACKET_SIZE)
 
 
 # PART 1
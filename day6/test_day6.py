@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import io
+import random
+import socket
+import threading
+
+from day6 import SAMPLE_CASES, SAMPLE_CASES2, load_text, find_markers, marker_end
+from day6 import iter_markers, read_chunks, stream_markers
+
+
+def brute_force(text, size):
+    for end in range(size, len(text) + 1):
+        if len(set(text[end - size:end])) == size:
+            return end
+    return None
+
+def test_find_markers_samples():
+    for (text, expected), (_, expected2) in zip(SAMPLE_CASES, SAMPLE_CASES2):
+        line = load_text(text)[0]
+        assert find_markers(line, [14, 4]) == {4: expected, 14: expected2}
+
+def test_find_markers_matches_brute_force():
+    rng = random.Random(6)
+    for _ in range(200):
+        text = "".join(rng.choices("abcdefgh", k=rng.randint(0, 40)))
+        sizes = [1, 3, 4, 6, 8, 9]
+        assert find_markers(text, sizes) == {size: brute_force(text, size) for size in sizes}
+        assert marker_end(text.encode(), 4) == brute_force(text, 4)
+
+def split_chunks(data, rng):
+    cuts = sorted(rng.sample(range(1, len(data)), min(5, len(data) - 1))) if len(data) > 1 else []
+    return [data[i:j] for i, j in zip([0] + cuts, cuts + [len(data)])]
+
+def test_stream_markers_across_chunks():
+    rng = random.Random(22)
+    for _ in range(200):
+        text = "".join(rng.choices("abcdefgh", k=rng.randint(0, 40))).encode()
+        chunks = split_chunks(text, rng)
+        assert stream_markers(chunks, [4, 6]) == find_markers(text, [4, 6])
+        assert list(iter_markers(chunks, 4)) == [
+            end for end in range(4, len(text) + 1) if len(set(text[end - 4:end])) == 4
+        ]
+
+def test_stream_markers_stops_reading():
+    def chunks():
+        yield b"abcd"
+        raise AssertionError("read past the marker")
+
+    assert stream_markers(chunks(), [4]) == {4: 4}
+
+def test_read_chunks_from_socket():
+    text = load_text(SAMPLE_CASES2[0][0])[0].encode() * 10
+    reader, writer = socket.socketpair()
+    sender = threading.Thread(target=lambda: (writer.sendall(text), writer.close()))
+    sender.start()
+    with reader, reader.makefile("rb") as stream:
+        found = stream_markers(read_chunks(stream, 7), [4, 14])
+    sender.join()
+    assert found == find_markers(text, [4, 14])
+    assert list(read_chunks(io.BytesIO(b"abcde"), 2)) == [b"ab", b"cd", b"e"]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+#  Benchmark the day 7 directory sizes on a large synthetic terminal log.
+#
+from pathlib import Path
+import argparse
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import bench
+import day7
+
+DEFAULT_ENTRIES = 10**6
+MAX_DEPTH = 30
+
+
+def make_log(path: Path, num_entries: int, seed: int = 2022) -> None:
+    """Write a terminal log that lists about num_entries files and directories.
+
+    It is a random walk down and up the tree, which lists each new directory
+    once, with up to ten files and three subdirectories.
+    """
+    rng = random.Random(seed)
+    lines = ["$ cd /"]
+    pending = [[]]
+    entries = 0
+    serial = 0
+    while entries < num_entries:
+        subdirs = pending[-1]
+        if subdirs and len(pending) < MAX_DEPTH and rng.random() < 0.6:
+            lines.append(f"$ cd {subdirs.pop()}")
+            lines.append("$ ls")
+            names = [f"d{serial + idx}" for idx in range(rng.randint(0, 3))]
+            serial += len(names)
+            lines.extend(f"dir {name}" for name in names)
+            for idx in range(rng.randint(1, 10)):
+                lines.append(f"{rng.randint(1, 300000)} f{idx}.txt")
+            entries += len(names) + idx + 1
+            pending.append(names)
+        elif len(pending) > 1:
+            lines.append("$ cd ..")
+            pending.pop()
+        else:
+            names = [f"d{serial + idx}" for idx in range(3)]
+            serial += 3
+            lines.append("$ ls")
+            lines.extend(f"dir {name}" for name in names)
+            pending[0].extend(names)
+    path.write_text("\n".join(lines) + "\n")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the day 7 directory sizes.")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="Number of entries")
+    opt = parser.parse_args()
+
+    write = lambda path: make_log(path, opt.entries)
+    with bench.synthetic_input(write, f"{opt.entries} entries") as infile:
+        lines, _ = bench.timed("load_input", day7.load_input, str(infile))
+
+        root, _ = bench.timed("parse_tree", day7.parse_tree, lines)
+        bench.timed("part 1 sizes", lambda: sum(
+            node.size for node in root.walk()
+            if node is not root and node.size <= day7.SIZE_THRESHOLD
+        ))
+        bench.timed("solve", day7.solve, lines)
+
+        index = day7.DirectoryIndex()
+        step = max(1, len(lines) // 100)
+        def feed_and_query():
+            for start in range(0, len(lines), step):
+                for line in lines[start:start + step]:
+                    index.feed(line)
+                index.total_at_most()
+                index.smallest_to_free()
+            return index.total_at_most()
+        bench.timed("DirectoryIndex, 100 queries", feed_and_query)
+        bench.timed("total_at_most", index.total_at_most)
+        bench.timed("smallest_to_free", lambda: index.smallest_to_free().size)
+
+
+if __name__ == "__main__":
+    main()
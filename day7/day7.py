@@ -2,12 +2,17 @@
 #
 #  Advent of Code 2022 - Day 7
 #
-from typing import Sequence, Union, Optional, Any, Dict, List
+from typing import Sequence, Union, Optional, Any, Dict, Iterator, List, Tuple
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
 import math
+import random
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text
 
 INPUTFILE = "input.txt"
 
@@ -53,22 +58,11 @@ Sections = Sequence[Lines]
 
 # Utility functions
 
-def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-## Use these if blank lines should be discarded.
-
-def load_text(text: str) -> Lines:
-    return filter_blank_lines(text.split("\n"))
-
-def filter_blank_lines(lines: Lines) -> Lines:
-    return [line.strip() for line in lines if line.strip()]
-
 # Solution
 
 PROMPT = "$"
@@ -79,97 +73,310 @@ SLASH = "/"
 DOTDOT = ".."
 
 
-def parse_commands(lines: Lines) -> Dict[str, int]:
-    files = {}
-    cwd = Path("/")
-
-    listing = False
-    for line in lines:
-        # print(f">>> {line}")
+class Directory():
+    """A directory in the filesystem tree built from the terminal output.
+
+    size is the total size of the files in the directory and all of its
+    subdirectories, once compute_sizes() has been run on the tree.
+    """
+    __slots__ = ("name", "parent", "children", "files", "size")
+
+    def __init__(self, name: str, parent: Optional["Directory"] = None):
+        self.name = name
+        self.parent = parent
+        self.children: Dict[str, "Directory"] = {}
+        self.files: Dict[str, int] = {}
+        self.size = 0
+
+    def __repr__(self) -> str:
+        return f"Directory({self.path()!r}, size={self.size})"
+
+    def subdir(self, name: str) -> "Directory":
+        """Return the named subdirectory, creating it if it is new."""
+        child = self.children.get(name)
+        if child is None:
+            child = self.children[name] = Directory(name, self)
+        return child
+
+    def path(self) -> str:
+        names = []
+        node = self
+        while node.parent:
+            names.append(node.name)
+            node = node.parent
+        return SLASH + SLASH.join(reversed(names))
+
+    def walk(self) -> Iterator["Directory"]:
+        """Yield this directory and all below it, each before its children."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+
+class Terminal():
+    """Follow the commands in a terminal log, and build the directory tree.
+
+    Lines can be fed in one at a time, as they arrive.  New directories and
+    files are added through add_dir() and add_file(), which subclasses can
+    extend.
+    """
+    def __init__(self):
+        self.root = Directory("")
+        self.cwd = self.root
+        self.listing = False
+
+    def feed(self, line: str) -> None:
         words = line.split()
+        if not words:
+            return
         if words[0] == PROMPT:
             cmd = words[1]
-            listing = False
+            self.listing = False
             if cmd == CD:
                 name = words[2]
                 if name == SLASH:
-                    cwd = Path("/")
+                    self.cwd = self.root
                 elif name == DOTDOT:
-                    cwd = cwd.parent
+                    self.cwd = self.cwd.parent or self.root
                 else:
-                    cwd = cwd / Path(name)
-                continue
+                    self.cwd = self.add_dir(self.cwd, name)
+                return
 
             if cmd == LS:
-                listing = True
-                continue
+                self.listing = True
+                return
 
             raise ValueError(f"Unrecognized command '{cmd}'")
 
+        assert self.listing
+        if words[0] == DIR:
+            self.add_dir(self.cwd, words[1])
         else:
-            assert listing
-            name = words[1]
-            filepath = str(cwd / Path(name))
-
-            if words[0] == DIR:
-                continue
-            size = int(words[0])
-            files[filepath] = size
+            self.add_file(self.cwd, words[1], int(words[0]))
 
-    return files
-        
+    def add_dir(self, parent: Directory, name: str) -> Directory:
+        return parent.subdir(name)
 
+    def add_file(self, directory: Directory, name: str, size: int) -> None:
+        directory.files[name] = size
 
-def directory_sizes(files: Dict[str, int]) -> Dict[str, int]:
-    dirsize = defaultdict(int)
 
-    print("--- files ---")
-    for filepath, size in sorted(files.items()):
-        # print(f"{size:-8d}  {filepath}")
-        dirpath, filename = filepath.rsplit(SLASH, maxsplit=1)
-        dirsize[dirpath] += size
-        # print(f"ADD {size:-8d} {dirpath}")
-        while dirpath:
-            dirpath, dirname = dirpath.rsplit(SLASH, maxsplit=1)
-            dirsize[dirpath] += size
-            # print(f"ADD {size:-8d} {dirpath}")
+def parse_tree(lines: Lines) -> Directory:
+    """Build the directory tree from the commands and their output."""
+    terminal = Terminal()
+    for line in lines:
+        terminal.feed(line)
+    compute_sizes(terminal.root)
+    return terminal.root
+
+def compute_sizes(root: Directory) -> None:
+    """Set the total size of every directory, in one post-order pass."""
+    for node in reversed(list(root.walk())):
+        node.size = sum(node.files.values()) + sum(
+            child.size for child in node.children.values()
+        )
+
+class SizeNode():
+    """A node of a SizeTree, with the total size of its subtree."""
+    __slots__ = ("key", "priority", "left", "right", "total")
+
+    def __init__(self, key: Tuple[int, int]):
+        self.key = key
+        self.priority = random.random()
+        self.left: Optional["SizeNode"] = None
+        self.right: Optional["SizeNode"] = None
+        self.total = key[0]
+
+    def update(self) -> "SizeNode":
+        self.total = self.key[0] + subtree_total(self.left) + subtree_total(self.right)
+        return self
+
+
+def subtree_total(node: Optional[SizeNode]) -> int:
+    return node.total if node else 0
+
+def split_treap(node: Optional[SizeNode], key: Tuple[int, int]) -> Tuple[Optional[SizeNode], Optional[SizeNode]]:
+    """Split a treap into the keys before the given key, and the rest."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, rest = split_treap(node.right, key)
+        return node.update(), rest
+    before, node.left = split_treap(node.left, key)
+    return before, node.update()
+
+def merge_treap(left: Optional[SizeNode], right: Optional[SizeNode]) -> Optional[SizeNode]:
+    """Join two treaps, where all the keys of the left one come first."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = merge_treap(left.right, right)
+        return left.update()
+    right.left = merge_treap(left, right.left)
+    return right.update()
+
+
+class SizeTree():
+    """A set of (size, serial) keys, ordered by size, in a treap.
+
+    Every node also holds the total size of its subtree, so that adding and
+    removing keys, summing the sizes up to a limit, and finding the smallest
+    size above a limit all take O(log n) expected time.
+    """
+    def __init__(self):
+        self.root: Optional[SizeNode] = None
+
+    def add(self, key: Tuple[int, int]) -> None:
+        # Walk down to where the new node's priority puts it, adding its size
+        # to the totals on the way, and split the subtree found there.
+        new = SizeNode(key)
+        parent, left, node = None, False, self.root
+        while node and node.priority > new.priority:
+            node.total += key[0]
+            parent, left = node, key < node.key
+            node = node.left if left else node.right
+        new.left, new.right = split_treap(node, key)
+        self._replace(parent, left, new.update())
+
+    def remove(self, key: Tuple[int, int]) -> None:
+        parent, left, node = None, False, self.root
+        while node.key != key:
+            node.total -= key[0]
+            parent, left = node, key < node.key
+            node = node.left if left else node.right
+        self._replace(parent, left, merge_treap(node.left, node.right))
+
+    def _replace(self, parent: Optional[SizeNode], left: bool, node: Optional[SizeNode]) -> None:
+        """Put the node in place of the given child of parent, or of the root."""
+        if parent is None:
+            self.root = node
+        elif left:
+            parent.left = node
+        else:
+            parent.right = node
+
+    def sum_at_most(self, limit: int) -> int:
+        """Return the total of all the sizes up to the limit."""
+        result = 0
+        node = self.root
+        while node:
+            if node.key[0] <= limit:
+                result += subtree_total(node.left) + node.key[0]
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+    def first_at_least(self, limit: int) -> Optional[Tuple[int, int]]:
+        """Return the smallest key whose size is at least the limit."""
+        found = None
+        node = self.root
+        while node:
+            if node.key[0] >= limit:
+                found = node.key
+                node = node.left
+            else:
+                node = node.right
+        return found
+
+
+class DirectoryIndex(Terminal):
+    """A directory tree that is kept up to date as a terminal log is fed in,
+    with an index of the directory sizes.
+
+    Each new file adds its size to its directory and all of that
+    directory's ancestors, which costs O(depth), and marks them as changed.
+    The changed directories are moved to their new place in the SizeTree
+    before the next query, which then takes O(log n).
+    """
+    def __init__(self):
+        super().__init__()
+        self.sizes = SizeTree()
+        self.directories: Dict[int, Directory] = {}
+        self.indexed: Dict[int, int] = {}
+        self.changed = set()
+        self._register(self.root)
+
+    def _register(self, node: Directory) -> None:
+        self.directories[id(node)] = node
+        self.changed.add(id(node))
+
+    def add_dir(self, parent: Directory, name: str) -> Directory:
+        if name in parent.children:
+            return parent.children[name]
+        child = parent.subdir(name)
+        self._register(child)
+        return child
+
+    def add_file(self, directory: Directory, name: str, size: int) -> None:
+        delta = size - directory.files.get(name, 0)
+        directory.files[name] = size
+        node = directory
+        while node:
+            node.size += delta
+            self.changed.add(id(node))
+            node = node.parent
+
+    def refresh(self) -> None:
+        """Move the directories whose sizes changed within the index."""
+        for serial in self.changed:
+            size = self.directories[serial].size
+            old_size = self.indexed.get(serial)
+            if old_size == size:
+                continue
+            if old_size is not None:
+                self.sizes.remove((old_size, serial))
+            self.sizes.add((size, serial))
+            self.indexed[serial] = size
+        self.changed.clear()
+
+    def size(self, path: str = SLASH) -> int:
+        """Return the total size of the directory with the given path."""
+        node = self.root
+        for name in path.strip(SLASH).split(SLASH):
+            if name:
+                node = node.children[name]
+        return node.size
+
+    def total_at_most(self, threshold: int = SIZE_THRESHOLD) -> int:
+        """Return the total size of the directories of at most threshold
+        bytes, not counting the root.
+        """
+        self.refresh()
+        result = self.sizes.sum_at_most(threshold)
+        if self.root.size <= threshold:
+            result -= self.root.size
+        return result
+
+    def smallest_to_free(self, min_size: int = MIN_SIZE, disk_size: int = DISK_SIZE) -> Optional[Directory]:
+        """Return the smallest directory whose deletion leaves min_size free."""
+        self.refresh()
+        key = self.sizes.first_at_least(min_size - (disk_size - self.root.size))
+        return self.directories[key[1]] if key else None
 
-    return dirsize
 
 def solve2(lines: Lines) -> int:
     """Solve the problem."""
-    files = parse_commands(lines)
-    dirsize = directory_sizes(files)
-    need = MIN_SIZE - (DISK_SIZE - dirsize[""])
+    root = parse_tree(lines)
+    need = MIN_SIZE - (DISK_SIZE - root.size)
     print(f"We need to find {need} bytes")
 
-    dirs = []
-    for dirpath, size in dirsize.items():
-        if size >= need:
-            dirs.append((size, dirpath))
-    dirs.sort()
-
-    size, dirpath = dirs[0]
-    print(f"This will work: {dirpath}  size: {size}")
+    node = min((node for node in root.walk() if node.size >= need), key=lambda node: node.size)
+    print(f"This will work: {node.path()}  size: {node.size}")
 
-    return size
+    return node.size
 
 def solve(lines: Lines) -> int:
     """Solve the problem."""
-    files = parse_commands(lines)
-    # print("--- files ---")
-    # for filepath, size in sorted(files.items()):
-    #     print(f"{size:-8d}  {filepath}")
-
-    dirsize = directory_sizes(files)
-    # print("--- directories ---")
-    total = 0
-    for dirpath, size in sorted(dirsize.items()):
-        # print(f"{size:-12d} {dirpath}")
-        if dirpath and size <= SIZE_THRESHOLD:
-            total += size
-
-    return total
+    root = parse_tree(lines)
+    return sum(
+        node.size for node in root.walk()
+        if node is not root and node.size <= SIZE_THRESHOLD
+    )
 
 
 # PART 1
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import random
+
+from day7 import SAMPLE, DISK_SIZE, MIN_SIZE, SIZE_THRESHOLD, load_text, parse_tree, solve, solve2
+from day7 import DirectoryIndex, SizeTree
+
+
+LINES = load_text(SAMPLE)
+
+def test_parse_tree_sizes():
+    root = parse_tree(LINES)
+    sizes = {node.path(): node.size for node in root.walk()}
+    assert sizes == {"/": 48381165, "/a": 94853, "/a/e": 584, "/d": 24933642}
+
+def test_parse_tree_relisted_directory():
+    lines = LINES + ["$ cd /", "$ cd a", "$ ls", "29116 f", "$ cd ..", "$ cd ..", "$ ls", "1 z"]
+    root = parse_tree(lines)
+    assert root.size == 48381165 + 1
+    assert root.children["a"].size == 94853
+
+def test_solve():
+    assert solve(LINES) == 95437
+    assert solve2(LINES) == 24933642
+
+def test_directory_index_matches_tree():
+    index = DirectoryIndex()
+    for count, line in enumerate(LINES, 1):
+        index.feed(line)
+        root = parse_tree(LINES[:count])
+        sizes = [node.size for node in root.walk()]
+        assert index.size() == root.size
+        assert index.total_at_most() == sum(
+            node.size for node in root.walk() if node is not root and node.size <= SIZE_THRESHOLD
+        )
+        need = MIN_SIZE - (DISK_SIZE - root.size)
+        smallest = index.smallest_to_free()
+        assert (smallest.size if smallest else None) == min(
+            (size for size in sizes if size >= need), default=None
+        )
+    assert index.size("/a/e") == 584
+    assert index.smallest_to_free().path() == "/d"
+
+def test_size_tree():
+    rng = random.Random(7)
+    tree = SizeTree()
+    keys = set()
+    for serial in range(300):
+        key = (rng.randint(0, 50), serial)
+        tree.add(key)
+        keys.add(key)
+        if rng.random() < 0.3:
+            gone = rng.choice(sorted(keys))
+            tree.remove(gone)
+            keys.discard(gone)
+        for limit in (0, 10, 25, 50):
+            assert tree.sum_at_most(limit) == sum(size for size, _ in keys if size <= limit)
+            assert tree.first_at_least(limit) == min((k for k in keys if k[0] >= limit), default=None)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+#
+#  Benchmark the day 8 visibility count on a large synthetic forest.
+#
+from pathlib import Path
+import argparse
+import random
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import bench
+import day8
+
+DEFAULT_SIZE = 5000
+MAX_LOOP_SIZE = 1000
+
+
+def make_forest(size: int, seed: int = 2022) -> list:
+    """Return size rows of size random tree heights."""
+    rng = random.Random(seed)
+    return ["".join(rng.choices("0123456789", k=size)) for _ in range(size)]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the day 8 visibility count.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Width and height of the forest")
+    opt = parser.parse_args()
+
+    lines = make_forest(opt.size)
+    print(f"{opt.size}x{opt.size} trees")
+    if opt.size <= MAX_LOOP_SIZE:
+        bench.timed("visible_trees", lambda: len(day8.visible_trees(lines)))
+    if day8.np is None:
+        print("NumPy is not installed")
+        return
+    grid, _ = bench.timed("load_grid", day8.load_grid, lines)
+    bench.timed("visibility", lambda: day8.visibility(grid)[0])
+
+
+if __name__ == "__main__":
+    main()
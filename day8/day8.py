@@ -2,12 +2,22 @@
 #
 #  Advent of Code 2022 - Day 8
 #
-from typing import Sequence, Union, Optional, Any
+from typing import Sequence, Union, Optional, Any, Tuple
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass
 import math
 import re
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from aoc_input import load_input, load_text
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy, solve() falls back to visible_trees().
+    np = None
 
 INPUTFILE = "input.txt"
 
@@ -43,20 +53,11 @@ Sections = Sequence[Lines]
 
 # Utility functions
 
-def load_input(infile: str) -> Lines:
-    return load_text(Path(infile).read_text())
-
 def sample_case(idx: int = 0) -> tuple[Lines, int]:
     text, expected = SAMPLE_CASES[idx]
     lines = load_text(text)
     return lines, expected
 
-def load_text(text: str) -> Lines:
-    return filter_blank_lines(text.split("\n"))
-
-def filter_blank_lines(lines: Lines) -> Lines:
-    return [line.strip() for line in lines if line.strip()]
-
 # Solution
 
 def visible_trees(lines) -> int:
@@ -106,6 +107,41 @@ def visible_trees(lines) -> int:
     return visible
 
 
+def load_grid(lines: Lines) -> "np.ndarray":
+    """Return the tree heights as a uint8 array, in one conversion."""
+    if np is None:
+        raise ImportError("load_grid requires NumPy")
+    nrow, ncol = len(lines), len(lines[0]) if lines else 0
+    codes = np.frombuffer("".join(lines).encode(), dtype=np.uint8)
+    return (codes - ord("0")).reshape(nrow, ncol)
+
+def visible_from_start(grid: "np.ndarray", axis: int) -> "np.ndarray":
+    """Return the mask of the trees that are taller than every tree before
+    them along the axis.
+    """
+    highest = np.maximum.accumulate(grid, axis=axis)
+    visible = np.ones(grid.shape, dtype=bool)
+    if axis == 0:
+        visible[1:] = grid[1:] > highest[:-1]
+    else:
+        visible[:, 1:] = grid[:, 1:] > highest[:, :-1]
+    return visible
+
+def visibility(grid: "np.ndarray") -> Tuple[int, "np.ndarray"]:
+    """Return the number of trees visible from outside the grid, and the
+    mask of those trees.
+
+    The running maximum height is computed along each row and column with
+    np.maximum.accumulate, once from each of the four sides; the right and
+    bottom sides use reversed views of the grid.
+    """
+    mask = visible_from_start(grid, 1)
+    mask |= visible_from_start(grid[:, ::-1], 1)[:, ::-1]
+    mask |= visible_from_start(grid, 0)
+    mask |= visible_from_start(grid[::-1], 0)[::-1]
+    return int(mask.sum()), mask
+
+
 def scenic_score(grid, pos) -> int:
     r, c = pos
     nrow, ncol = len(grid), len(grid[0])
@@ -157,6 +193,8 @@ def solve2(lines: Lines) -> int:
 
 def solve(lines: Lines) -> int:
     """Solve the problem."""
+    if np is not None:
+        return visibility(load_grid(lines))[0]
     visible = visible_trees(lines)
     return len(visible)
 
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+import random
+
+import pytest
+
+from day8 import SAMPLE_CASES, load_text, visible_trees, solve
+import day8
+
+
+def test_visibility_matches_visible_trees():
+    pytest.importorskip("numpy")
+    rng = random.Random(8)
+    grids = [load_text(SAMPLE_CASES[0][0])]
+    grids += [
+        ["".join(rng.choices("0123456789", k=ncol)) for _ in range(nrow)]
+        for nrow, ncol in [(1, 1), (1, 7), (6, 1), (9, 13), (20, 20)]
+    ]
+    for lines in grids:
+        count, mask = day8.visibility(day8.load_grid(lines))
+        visible = visible_trees(lines)
+        assert count == len(visible)
+        assert set(zip(*mask.nonzero())) == visible
+
+def test_solve_without_numpy(monkeypatch):
+    lines = load_text(SAMPLE_CASES[0][0])
+    monkeypatch.setattr(day8, "np", None)
+    assert solve(lines) == SAMPLE_CASES[0][1]
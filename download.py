@@ -3,15 +3,18 @@
 A utility module for pulling data from the AdventOfCode site.
 """
 import sys
+from typing import List, Optional, Sequence, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 import logging
+import threading
+import time
 
 import requests
-from bs4 import BeautifulSoup
-from markdownify import markdownify
 
 import aoc
+import run
 
 
 FMT_HTML = "html"
@@ -25,16 +28,57 @@ SUFFIX_FORMAT = {
     ".txt": FMT_TEXT,
 }
 
+ALL_DAYS = range(1, 26)
+INPUT_FILENAME = "input.txt"
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 2.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+# HTTP status codes for which a request is worth retrying.
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
 
 logging.basicConfig(format="%(message)s", stream=sys.stdout, level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class UsageError(Exception):
-    """A UsageError is raised when there's an issue parsing the command-line options."""
+class RateLimiter:
+    """A RateLimiter spaces out calls to wait(), across threads, so that they
+    return no more than rate times per second.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def page_to_markdown(page_html: str) -> str:
+    """Convert the main part of a puzzle page to Markdown.
+
+    BeautifulSoup and markdownify are slow to import, so they're only loaded
+    when a page actually needs converting, and not when downloading input.
+    """
+    from bs4 import BeautifulSoup
+    from markdownify import markdownify
 
+    main = BeautifulSoup(page_html, "html.parser").find("main")
+    if main is None:
+        raise ValueError("Page has no <main> element")
+    return markdownify(str(main))
 
-def parse_args():
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Write the day's problem description to a text file."
     )
@@ -51,6 +95,33 @@ def parse_args():
         action="store_true",
         help="Download the day's input file",
     )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Download the description and input of every day of the year",
+    )
+    parser.add_argument(
+        "--days",
+        help="Download the description and input of the given days, e.g. '1-25'",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of concurrent downloads with --all or --days (default {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help=f"Maximum requests per second with --all or --days (default {DEFAULT_RATE})",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Number of retries of a failed request (default {DEFAULT_RETRIES})",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -58,7 +129,17 @@ def parse_args():
     )
     aoc.add_arguments(parser)
 
-    opt = parser.parse_args()
+    opt = parser.parse_args(argv)
+
+    if opt.all:
+        opt.days = "all"
+    if opt.days:
+        if opt.outfile or opt.input or opt.format:
+            raise run.UsageError("--all and --days can't be used with --outfile, --input, or --format")
+        opt.days = run.parse_days(opt.days, ALL_DAYS)
+        if opt.workers < 1:
+            raise run.UsageError("--workers must be at least 1")
+        return opt
 
     if opt.input and opt.format:
         logger.warning("--format is ignored when writing input data")
@@ -73,18 +154,120 @@ def parse_args():
     if not opt.format:
         opt.format = FMT_MD
     if opt.format not in OUTPUT_FORMATS:
-        raise UsageError(f"Unrecognized format '{opt.format}'")
+        raise run.UsageError(f"Unrecognized format '{opt.format}'")
 
     return opt
 
 
-def main() -> int:
-    opt = parse_args()
+def fetch_page(
+    client: aoc.Client,
+    year: str,
+    day: int,
+    path: str = "",
+    raw: bool = False,
+    limiter: Optional[RateLimiter] = None,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> str:
+    """Download a page, retrying with exponential backoff if the request fails
+    with a connection error or a transient HTTP error.
+    """
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.wait()
+        try:
+            return client.get_page(year=year, day=str(day), path=path, raw=raw, check=True)
+        except requests.RequestException as exc:
+            status = getattr(exc.response, "status_code", None)
+            if attempt == retries or (status is not None and status not in RETRY_STATUS):
+                raise
+            delay = backoff * 2 ** attempt
+            logger.debug(f"Retrying day {day} {path or 'page'} in {delay:.1f}s ({exc})")
+            time.sleep(delay)
+
+def download_days(
+    client: aoc.Client,
+    year: str,
+    days: Sequence[int],
+    base_dir: Path = aoc.BASE_DIR,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = DEFAULT_RATE,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> Tuple[List[Path], List[Path]]:
+    """Download the description and input for each of the given days into its
+    dayN directory, skipping any file that already exists.  The downloads run
+    in a pool of threads sharing the client's session.
+
+    Returns the files that were written, and those that couldn't be.
+    """
+    limiter = RateLimiter(rate)
+
+    def download(day: int, path: str, outfile: Path) -> Optional[Path]:
+        if outfile.exists():
+            logger.debug(f"Skipped {outfile}")
+            return None
+        text = fetch_page(
+            client, year, day, path=path, raw=bool(path),
+            limiter=limiter, retries=retries, backoff=backoff,
+        )
+        if not path:
+            text = page_to_markdown(text)
+        outfile.parent.mkdir(parents=True, exist_ok=True)
+        outfile.write_text(text)
+        logger.info(f"Wrote {outfile}")
+        return outfile
+
+    jobs = []
+    for day in days:
+        day_dir = Path(base_dir) / f"day{day}"
+        jobs.append((day, "", day_dir / f"day{day}.md"))
+        jobs.append((day, "input", day_dir / INPUT_FILENAME))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(download, *job) for job in jobs]
+        written = []
+        failed = []
+        for (day, path, outfile), future in zip(jobs, futures):
+            try:
+                result = future.result()
+            except requests.RequestException as exc:
+                logger.error(f"Unable to download {outfile}: {exc}")
+                failed.append(outfile)
+                continue
+            except Exception:
+                logger.exception(f"Unable to write {outfile}")
+                failed.append(outfile)
+                continue
+            if result:
+                written.append(result)
+    return written, failed
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    opt = parse_args(argv)
     if opt.debug:
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("[debug mode]")
 
-    aoc_client = aoc.Client(year=opt.year, day=opt.day, session=opt.session_key)
+    cache_dir = None if opt.no_cache else aoc.BASE_DIR / aoc.CACHE_DIRNAME
+    aoc_client = aoc.Client(
+        year=opt.year, day=opt.day, session=opt.session_key, cache_dir=cache_dir
+    )
+
+    if opt.days:
+        _, failed = download_days(
+            aoc_client,
+            opt.year,
+            opt.days,
+            workers=opt.workers,
+            rate=opt.rate,
+            retries=opt.retries,
+        )
+        if failed:
+            logger.error(f"{len(failed)} file(s) could not be downloaded")
+            return 1
+        return 0
 
     if opt.input:
         input_text = aoc_client.get_page(year=opt.year, day=opt.day, path="input", raw=True)
@@ -101,8 +284,7 @@ def main() -> int:
     if opt.format == FMT_HTML:
         output_text = page_html
     elif opt.format in (FMT_TEXT, FMT_MD):
-        soup = BeautifulSoup(page_html, "html.parser")
-        output_text = markdownify(str(soup.body.main))
+        output_text = page_to_markdown(page_html)
 
     if opt.outfile:
         with Path(opt.outfile).open("w") as fp:
@@ -115,4 +297,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,737 @@
+#!/usr/bin/env python3
+"""
+Run the daily solutions in a single interpreter and report how long each part takes.
+
+Each dayN/dayN.py module is imported once, its input is loaded once, and the
+selected parts are run through the module's solve() and solve2() functions.
+With --jobs, the parts are run in a pool of worker processes instead, slowest
+first, according to the timings recorded by earlier runs.
+
+With --profile, each solver is run under cProfile.  The stats for each part
+are saved as a .pstats file, along with a .collapsed file of folded stacks
+that flame graph tools can read, and the top functions are printed.
+
+With --memory, each solver's allocations are traced with tracemalloc, and the
+peak traced memory and the top allocation sites are reported.
+
+Results are cached in .result_cache, keyed by a hash of the day's input, the
+source of its modules, and the solver's name and arguments.  A cached result
+(and its recorded timing) is reported instead of re-running the solver, until
+the code or the input changes.  Use --no-cache to bypass the cache.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from pathlib import Path
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import ModuleType
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import ast
+import contextlib
+import cProfile
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import math
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+
+BASE_DIR = Path(__file__).parent
+
+TIMINGS_FILENAME = "run_timings.json"
+RESULT_CACHE_DIRNAME = ".result_cache"
+
+# Limits on the result cache, beyond which the least recently used entries
+# are evicted.
+DEFAULT_CACHE_MAX_SIZE = 10 * 2**20
+DEFAULT_CACHE_MAX_AGE = 30 * 24 * 3600
+PROFILE_DIRNAME = "profiles"
+
+DEFAULT_TOP = 15
+
+DEFAULT_TOP_ALLOCATIONS = 5
+
+# While tracing memory, how often (in seconds) the traced memory is checked,
+# and by what factor it must grow before another snapshot is taken.
+MEMORY_POLL_INTERVAL = 0.01
+MEMORY_SNAPSHOT_GROWTH = 1.25
+
+# Stacks that account for less time than this (in seconds) are left out of
+# the collapsed stacks.
+MIN_STACK_TIME = 1e-6
+
+DAY_DIR_RE = re.compile(r"day(\d+)$")
+
+PARTS = (1, 2)
+SOLVERS = {1: "solve", 2: "solve2"}
+PART_FUNCS = {1: "part1", 2: "part2"}
+
+# The templates use -1 as the expected value until the answer is known.
+UNKNOWN_RESULT = -1
+
+# Options for load_input() that differ from the defaults, as used in each
+# day's __main__ block.
+LOAD_OPTIONS: Dict[int, Dict[str, Any]] = {
+    13: {"blank_lines": True},
+    22: {"strip": False, "blank_lines": True},
+}
+
+# Days whose solvers take the first input line, rather than a list of lines.
+SINGLE_LINE_DAYS = {6}
+
+# Shared modules that every day uses to load its input.
+LOADER_SOURCES = (BASE_DIR / "aoc_input.py",)
+
+# Extra arguments passed to a solver after its input, as used in each day's
+# part1() and part2() functions.
+SOLVER_ARGS: Dict[Tuple[int, int], Callable[[ModuleType], tuple]] = {
+    (15, 1): lambda module: (2000000,),
+    (15, 2): lambda module: (4000000,),
+    (17, 2): lambda module: (module.NUM_ROCKS2,),
+}
+
+
+logging.basicConfig(format="%(message)s", stream=sys.stdout, level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class UsageError(Exception):
+    """A UsageError is raised when there's an issue parsing the command-line options."""
+
+
+@dataclass
+class PartResult:
+    """The outcome of running one part of one day's puzzle."""
+    day: int
+    part: int
+    result: Any = None
+    expected: Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    error: Optional[str] = None
+    peak_memory: Optional[int] = None
+    top_allocations: List[Tuple[str, int]] = field(default_factory=list)
+    cached: bool = False
+
+    @property
+    def status(self) -> str:
+        if self.error:
+            return "ERROR"
+        if self.expected is None:
+            return "-"
+        return "ok" if self.result == self.expected else "FAIL"
+
+
+# Discovering and loading the solutions
+
+def find_days(base_dir: Path = BASE_DIR) -> List[int]:
+    """Return the days for which there is a dayN/dayN.py module, in calendar order."""
+    days = []
+    for path in base_dir.iterdir():
+        m = DAY_DIR_RE.match(path.name)
+        if m and path.is_dir() and (path / f"{path.name}.py").exists():
+            days.append(int(m.group(1)))
+    return sorted(days)
+
+def day_dir(day: int) -> Path:
+    return BASE_DIR / f"day{day}"
+
+@lru_cache(maxsize=None)
+def load_day(day: int) -> ModuleType:
+    """Import the module for the given day.
+
+    Each day's directory is put on the import path while its module is loaded,
+    so that helpers like pos.py and device.py can be found.  Those helpers are
+    dropped from sys.modules afterwards, because several days have their own
+    module with the same name.
+    """
+    directory = day_dir(day)
+    name = f"day{day}"
+    spec = importlib.util.spec_from_file_location(name, directory / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+
+    before = set(sys.modules)
+    sys.path.insert(0, str(directory))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(directory))
+        for modname in set(sys.modules) - before:
+            modfile = getattr(sys.modules[modname], "__file__", None) or ""
+            if Path(modfile).parent == directory:
+                del sys.modules[modname]
+    return module
+
+def input_path(day: int) -> Path:
+    return day_dir(day) / getattr(load_day(day), "INPUTFILE", "input.txt")
+
+@lru_cache(maxsize=None)
+def load_day_input(day: int) -> Sequence[str]:
+    """Load the input lines for the given day, the way its __main__ block does."""
+    module = load_day(day)
+    return module.load_input(str(input_path(day)), **LOAD_OPTIONS.get(day, {}))
+
+def solver_args(day: int, part: int, lines: Sequence[str]) -> tuple:
+    """Return the arguments with which to call the solver for a day's part."""
+    module = load_day(day)
+    data = lines[0] if day in SINGLE_LINE_DAYS else lines
+    extra = SOLVER_ARGS.get((day, part))
+    return (data,) + (extra(module) if extra else ())
+
+@lru_cache(maxsize=None)
+def expected_result(day: int, part: int) -> Any:
+    """Return the answer asserted in a day's part1() or part2() function.
+
+    None is returned if the function makes no assertion about its result,
+    or only asserts the template's placeholder value.
+    """
+    module = load_day(day)
+    tree = ast.parse(Path(module.__file__).read_text())
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == PART_FUNCS[part]:
+            for stmt in ast.walk(node):
+                if (
+                    isinstance(stmt, ast.Assert)
+                    and isinstance(stmt.test, ast.Compare)
+                    and isinstance(stmt.test.left, ast.Name)
+                    and stmt.test.left.id == "result"
+                    and isinstance(stmt.test.ops[0], ast.Eq)
+                ):
+                    expr = ast.Expression(stmt.test.comparators[0])
+                    value = eval(compile(expr, module.__file__, "eval"), vars(module))
+                    return None if value == UNKNOWN_RESULT else value
+    return None
+
+
+class MemoryTracer:
+    """A MemoryTracer traces memory allocations with tracemalloc while in use
+    as a context manager.  It records the peak traced memory, and the sites
+    that allocated the most memory close to that peak.
+
+    Allocations freed before the end can't be found from a final snapshot, so
+    a background thread takes a snapshot whenever the traced memory reaches a
+    new high (by a factor of MEMORY_SNAPSHOT_GROWTH).
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP_ALLOCATIONS):
+        self.top = top
+        self.peak = 0
+        self.top_allocations: List[Tuple[str, int]] = []
+        self._snapshot = None
+        self._snapshot_size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def __enter__(self) -> "MemoryTracer":
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._start_size = tracemalloc.get_traced_memory()[0]
+        self._thread.start()
+        return self
+
+    def _poll(self) -> None:
+        while not self._stop.wait(MEMORY_POLL_INTERVAL):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > max(self._snapshot_size * MEMORY_SNAPSHOT_GROWTH, self._start_size):
+                self._snapshot = tracemalloc.take_snapshot()
+                self._snapshot_size = current
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._snapshot is None or current > self._snapshot_size:
+            self._snapshot = tracemalloc.take_snapshot()
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+        self.peak = max(0, peak - self._start_size)
+        snapshot = self._snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        self.top_allocations = [
+            (allocation_site(stat.traceback[0]), stat.size)
+            for stat in snapshot.statistics("lineno")[:self.top]
+        ]
+        self._snapshot = None
+
+def allocation_site(frame: tracemalloc.Frame) -> str:
+    path = Path(frame.filename)
+    if path.is_relative_to(BASE_DIR):
+        path = path.relative_to(BASE_DIR)
+    return f"{path}:{frame.lineno}"
+
+
+class ResultCache:
+    """A ResultCache keeps the results of solvers on disk, with their timings.
+
+    Entries are content-addressed: the key is a hash of the day's input file,
+    the source of the day's modules and of the shared input loader, the load
+    options, and the solver's name and extra arguments, so an entry is never
+    stale.  Entries are evicted once they're older than
+    max_age seconds, or, least recently used first, when the cache grows larger
+    than max_size bytes.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        max_age: float = DEFAULT_CACHE_MAX_AGE,
+    ):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def key(self, day: int, part: int) -> str:
+        digest = hashlib.sha256()
+        digest.update(input_path(day).read_bytes())
+        for source in sorted(day_dir(day).glob("*.py")):
+            if not source.name.startswith("test_"):
+                digest.update(source.name.encode())
+                digest.update(source.read_bytes())
+        for source in LOADER_SOURCES:
+            digest.update(source.name.encode())
+            digest.update(source.read_bytes())
+        digest.update(repr((LOAD_OPTIONS.get(day), day in SINGLE_LINE_DAYS)).encode())
+        extra = SOLVER_ARGS.get((day, part))
+        digest.update(SOLVERS[part].encode())
+        digest.update(repr(extra(load_day(day)) if extra else ()).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, outcome: PartResult) -> None:
+        entry = {"result": outcome.result, "wall": outcome.wall, "cpu": outcome.cpu}
+        try:
+            text = json.dumps(entry)
+        except TypeError:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(key).write_text(text)
+
+    def evict(self) -> None:
+        """Remove entries that are too old, then the least recently used
+        entries until the cache is small enough.
+        """
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+# Running the solutions
+
+def run_part(
+    day: int,
+    part: int,
+    check: bool = False,
+    verbose: bool = False,
+    profile_dir: Optional[Path] = None,
+    trace_memory: bool = False,
+    cache: Optional[ResultCache] = None,
+) -> PartResult:
+    """Run one part of the given day's puzzle on its input, and time the solver.
+
+    If profile_dir is given, the solver is run under cProfile and its stats
+    are saved in that directory.  If trace_memory is true, the solver's peak
+    memory and top allocation sites are recorded.  If a cache is given, and it
+    holds the result for the current code and input, that result is returned
+    without running the solver.
+    """
+    outcome = PartResult(day=day, part=part)
+    try:
+        module = load_day(day)
+        solver = getattr(module, SOLVERS[part])
+        if check:
+            outcome.expected = expected_result(day, part)
+        cache_key = cache.key(day, part) if cache else None
+        entry = cache.get(cache_key) if cache else None
+        if entry:
+            outcome.result, outcome.wall, outcome.cpu = entry["result"], entry["wall"], entry["cpu"]
+            outcome.cached = True
+            return outcome
+        args = solver_args(day, part, load_day_input(day))
+    except Exception as exc:
+        outcome.error = f"{type(exc).__name__}: {exc}"
+        return outcome
+
+    profiler = cProfile.Profile() if profile_dir else None
+    tracer = MemoryTracer() if trace_memory else None
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output, tracer or contextlib.nullcontext():
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            if profiler:
+                outcome.result = profiler.runcall(solver, *args)
+            else:
+                outcome.result = solver(*args)
+        except Exception as exc:
+            outcome.error = f"{type(exc).__name__}: {exc}"
+        outcome.wall = time.perf_counter() - wall_start
+        outcome.cpu = time.process_time() - cpu_start
+    if profiler:
+        save_profile(profiler, profile_path(profile_dir, day, part))
+    if tracer:
+        outcome.peak_memory = tracer.peak
+        outcome.top_allocations = tracer.top_allocations
+    if cache and not outcome.error:
+        cache.put(cache_key, outcome)
+    return outcome
+
+def run_parts(jobs: Iterable[Tuple[int, int]], **options) -> List[PartResult]:
+    """Run each (day, part) job in turn, in this process.
+
+    The options are passed on to run_part().
+    """
+    return [run_part(day, part, **options) for day, part in jobs]
+
+def schedule(jobs: Iterable[Tuple[int, int]], timings: Dict[str, float]) -> List[Tuple[int, int]]:
+    """Order the jobs so that the slowest ones start first.
+
+    Jobs with no recorded timing are assumed to be slow, and go first of all.
+    """
+    def expected_time(job: Tuple[int, int]) -> float:
+        return timings.get(timing_key(*job), math.inf)
+    return sorted(jobs, key=expected_time, reverse=True)
+
+def run_parts_parallel(
+    jobs: Iterable[Tuple[int, int]],
+    workers: Optional[int] = None,
+    timings: Optional[Dict[str, float]] = None,
+    **options,
+) -> List[PartResult]:
+    """Run the (day, part) jobs in a pool of worker processes.
+
+    Jobs are submitted longest-expected first, so that the slowest parts don't
+    end up starting last.  The results are returned in the order of the jobs.
+    The options are passed on to run_part().
+    """
+    jobs = list(jobs)
+    ordered = schedule(jobs, timings or {})
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {job: executor.submit(run_part, *job, **options) for job in ordered}
+        return [futures[job].result() for job in jobs]
+
+
+# Recorded timings
+
+def timing_key(day: int, part: int) -> str:
+    return f"{day}.{part}"
+
+def load_timings(path: Path = BASE_DIR / TIMINGS_FILENAME) -> Dict[str, float]:
+    """Return the wall times recorded by earlier runs, keyed by timing_key()."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_timings(
+    outcomes: Sequence[PartResult],
+    path: Path = BASE_DIR / TIMINGS_FILENAME,
+) -> None:
+    """Record the wall time of each successful part, for scheduling later runs."""
+    timings = load_timings(path)
+    for r in outcomes:
+        if not r.error:
+            timings[timing_key(r.day, r.part)] = round(r.wall, 4)
+    path.write_text(json.dumps(timings, indent=2, sort_keys=True) + "\n")
+
+
+# Profiling
+
+def profile_path(profile_dir: Path, day: int, part: int) -> Path:
+    """Return the path of a part's profile, without its suffix."""
+    return Path(profile_dir) / f"day{day}_part{part}"
+
+def save_profile(profiler: cProfile.Profile, path: Path) -> None:
+    """Save the profiler's stats as path.pstats, and its stacks as path.collapsed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(path.with_suffix(".pstats")))
+    stacks = collapsed_stacks(pstats.Stats(profiler))
+    path.with_suffix(".collapsed").write_text("".join(f"{line}\n" for line in stacks))
+
+def function_label(func: Tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({Path(filename).name}:{lineno})"
+    return label.replace(";", ",")
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """Return the profile as folded stacks, one "caller;callee count" line per stack.
+
+    cProfile only records caller/callee pairs, not whole stacks, so the time
+    of each function is divided among its callers in proportion to the time
+    spent in each call.  The counts are in microseconds.
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, edge_time) in callers.items():
+            callees[caller][func] = edge_time
+    roots = [func for func, entry in stats.stats.items() if not entry[4]]
+
+    folded = defaultdict(float)
+
+    def walk(func, stack, on_stack, total):
+        _, _, self_time, cumulative, _ = stats.stats[func]
+        if cumulative <= 0 or total < MIN_STACK_TIME:
+            return
+        stack = stack + [function_label(func)]
+        folded[";".join(stack)] += total * self_time / cumulative
+        for callee, edge_time in callees[func].items():
+            if callee not in on_stack:
+                walk(callee, stack, on_stack | {callee}, total * edge_time / cumulative)
+
+    for root in roots:
+        walk(root, [], {root}, stats.stats[root][3])
+
+    return [
+        f"{stack} {round(seconds * 1e6)}"
+        for stack, seconds in sorted(folded.items())
+        if round(seconds * 1e6) > 0
+    ]
+
+def print_profile(path: Path, top: int = DEFAULT_TOP) -> None:
+    """Print the top functions of a saved profile, by cumulative time."""
+    pstats_file = path.with_suffix(".pstats")
+    if not pstats_file.exists():
+        return
+    logger.info(f"\n{pstats_file}:")
+    stats = pstats.Stats(str(pstats_file), stream=sys.stdout)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+
+# Reporting
+
+def format_result(result: Any, width: int = 24) -> str:
+    text = str(result).replace("\n", " ")
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+def format_size(size: int) -> str:
+    return f"{size / 2**20:.1f} MiB" if size >= 2**20 else f"{size / 2**10:.1f} KiB"
+
+def report(outcomes: Sequence[PartResult], wall: Optional[float] = None) -> None:
+    memory = any(r.peak_memory is not None for r in outcomes)
+    peak_header = f" {'peak mem':>10}" if memory else ""
+    logger.info(
+        f"{'day':>3} {'part':>4} {'wall (s)':>10} {'cpu (s)':>10}{peak_header}  {'result':24}  status"
+    )
+    for r in outcomes:
+        shown = r.error if r.error else format_result(r.result)
+        peak = ""
+        if memory:
+            peak = f" {format_size(r.peak_memory) if r.peak_memory is not None else '':>10}"
+        cached = " (cached)" if r.cached else ""
+        logger.info(
+            f"{r.day:3d} {r.part:4d} {r.wall:10.4f} {r.cpu:10.4f}{peak}  {format_result(shown):24}  {r.status}{cached}"
+        )
+    total_cpu = sum(r.cpu for r in outcomes)
+    total_wall = sum(r.wall for r in outcomes) if wall is None else wall
+    logger.info(f"{'total':>8} {total_wall:10.4f} {total_cpu:10.4f}")
+
+def report_allocations(outcomes: Sequence[PartResult]) -> None:
+    """Print the top allocation sites of each part."""
+    for r in outcomes:
+        if not r.top_allocations:
+            continue
+        logger.info(f"\nday {r.day} part {r.part}: peak {format_size(r.peak_memory)}")
+        for site, size in r.top_allocations:
+            logger.info(f"  {format_size(size):>10}  {site}")
+
+
+# Command-line interface
+
+def parse_days(spec: str, available: Sequence[int]) -> List[int]:
+    """Parse a day specification like "1-5,7,12" into a list of days."""
+    days = set()
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if item.lower() == "all":
+            days.update(available)
+            continue
+        try:
+            if "-" in item:
+                first, last = item.split("-", 1)
+                days.update(range(int(first), int(last) + 1))
+            else:
+                days.add(int(item))
+        except ValueError:
+            raise UsageError(f"Unrecognized day specification '{item}'")
+    missing = days - set(available)
+    if missing:
+        raise UsageError(f"Day(s) {', '.join(map(str, sorted(missing)))} not available")
+    return sorted(days)
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "days",
+        nargs="?",
+        default="all",
+        help="The days to run, e.g. '1-5,7' (default: all)",
+    )
+    parser.add_argument(
+        "--part",
+        "-p",
+        type=int,
+        choices=PARTS,
+        action="append",
+        help="Run only the given part (may be repeated)",
+    )
+    parser.add_argument(
+        "--check",
+        "-c",
+        action="store_true",
+        help="Compare results with the answers asserted in each day's module",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes to use (0 means one per CPU; default 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each solver, saving its stats and collapsed stacks",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=str(BASE_DIR / PROFILE_DIRNAME),
+        help="The directory in which to save profiles",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        help=f"Number of functions to show from each profile (default {DEFAULT_TOP})",
+    )
+    parser.add_argument(
+        "--memory",
+        "-m",
+        action="store_true",
+        help="Trace each solver's memory, reporting its peak and top allocation sites",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run every solver, rather than reporting cached results",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=float,
+        default=DEFAULT_CACHE_MAX_SIZE / 2**20,
+        help="Size of the result cache, in MiB, beyond which old entries are evicted",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=DEFAULT_CACHE_MAX_AGE / (24 * 3600),
+        help="Age, in days, after which entries are evicted from the result cache",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Show the output printed by the solvers",
+    )
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the daily solutions and report the time taken by each part."
+    )
+    add_arguments(parser)
+    opt = parser.parse_args(argv)
+    opt.days = parse_days(opt.days, find_days())
+    opt.parts = sorted(set(opt.part)) if opt.part else list(PARTS)
+    if opt.jobs < 0:
+        raise UsageError("--jobs must not be negative")
+    if opt.jobs == 0:
+        opt.jobs = os.cpu_count() or 1
+    return opt
+
+def select_jobs(days: Sequence[int], parts: Sequence[int]) -> List[Tuple[int, int]]:
+    return [(day, part) for day in days for part in parts]
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    opt = parse_args(argv)
+    jobs = select_jobs(opt.days, opt.parts)
+    profile_dir = Path(opt.profile_dir) if opt.profile else None
+
+    # Profiling and memory tracing need the solvers to actually run.
+    cache = None
+    if not (opt.no_cache or opt.profile or opt.memory):
+        cache = ResultCache(
+            BASE_DIR / RESULT_CACHE_DIRNAME,
+            max_size=int(opt.cache_max_size * 2**20),
+            max_age=opt.cache_max_age * 24 * 3600,
+        )
+
+    options = dict(
+        check=opt.check,
+        verbose=opt.verbose,
+        profile_dir=profile_dir,
+        trace_memory=opt.memory,
+        cache=cache,
+    )
+    start = time.perf_counter()
+    if opt.jobs > 1:
+        outcomes = run_parts_parallel(jobs, workers=opt.jobs, timings=load_timings(), **options)
+    else:
+        outcomes = run_parts(jobs, **options)
+    elapsed = time.perf_counter() - start
+
+    if cache:
+        cache.evict()
+    if profile_dir:
+        for day, part in jobs:
+            print_profile(profile_path(profile_dir, day, part), top=opt.top)
+    elif not opt.memory:
+        save_timings([r for r in outcomes if not r.cached])
+    report_allocations(outcomes)
+    report(outcomes, wall=elapsed)
+    return 1 if any(r.status in ("ERROR", "FAIL") for r in outcomes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
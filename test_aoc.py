@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+import pytest
+
+pytest.importorskip("requests")
+
+import aoc
+
+
+PAGE = b"<html><body><main>Puzzle</main></body></html>"
+INPUT = b"1\n2\n3\n"
+ETAG = '"v1"'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves a puzzle page with an ETag, and an input without one."""
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path.endswith("/input"):
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(INPUT)
+        elif self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.requests = []
+    httpd = HTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def make_client(server, cache_dir):
+    host, port = server.server_address
+    url_template = f"http://{host}:{port}/{{year}}/day/{{day}}{{path}}"
+    return aoc.Client(year="2022", day="1", cache_dir=cache_dir, url_template=url_template)
+
+def test_page_is_revalidated(server, tmp_path):
+    client = make_client(server, tmp_path)
+    assert client.get_page() == PAGE.decode()
+    assert client.get_page() == PAGE.decode()
+    assert StandInHandler.requests == [("/2022/day/1", None), ("/2022/day/1", ETAG)]
+
+def test_input_is_served_from_cache(server, tmp_path):
+    client = make_client(server, tmp_path)
+    assert client.get_page(path="input", raw=True) == INPUT.decode()
+    client = make_client(server, tmp_path)
+    assert client.get_page(path="input", raw=True) == INPUT.decode()
+    assert len(StandInHandler.requests) == 1
+
+def test_no_cache(server):
+    client = make_client(server, None)
+    client.get_page()
+    client.get_page()
+    assert StandInHandler.requests == [("/2022/day/1", None), ("/2022/day/1", None)]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import pytest
+
+import aoc_input
+from aoc_input import iter_lines, iter_sections, load_input, load_text, parse_sections
+
+
+TEXT = "\n  a  \n\nb\n   \nc\n\n"
+
+def test_load_text_defaults():
+    assert load_text(TEXT) == ["a", "b", "c"]
+
+def test_load_text_blank_lines():
+    assert load_text(TEXT, blank_lines=True) == ["a", "", "b", "", "c"]
+
+def test_load_text_unstripped():
+    assert load_text(TEXT, strip=False) == ["  a  ", "b", "c"]
+    assert load_text(TEXT, strip=False, blank_lines=True) == ["  a  ", "", "b", "   ", "c"]
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_load_input_matches_load_text(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(aoc_input, "CHUNK_SIZE", chunk_size)
+    infile = tmp_path / "input.txt"
+    infile.write_text(TEXT)
+    for kwargs in ({}, {"blank_lines": True}, {"strip": False, "blank_lines": True}):
+        assert load_input(infile, **kwargs) == load_text(TEXT, **kwargs)
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_load_input_crlf(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(aoc_input, "CHUNK_SIZE", chunk_size)
+    infile = tmp_path / "input.txt"
+    infile.write_bytes(TEXT.replace("\n", "\r\n").encode())
+    for kwargs in ({}, {"blank_lines": True}, {"strip": False, "blank_lines": True}):
+        assert load_input(infile, **kwargs) == load_text(TEXT, **kwargs)
+    assert load_input(infile, strip=False, binary=True) == [b"  a  ", b"b", b"c"]
+
+def test_iter_lines_binary(tmp_path):
+    infile = tmp_path / "input.txt"
+    infile.write_text("12\n34")
+    lines = iter_lines(infile, binary=True)
+    assert next(lines) == b"12"
+    assert list(lines) == [b"34"]
+
+def test_load_input_empty_file(tmp_path):
+    infile = tmp_path / "input.txt"
+    infile.write_text("")
+    assert load_input(infile) == []
+
+def test_parse_sections():
+    lines = load_text(TEXT, blank_lines=True)
+    assert parse_sections(lines) == [["a"], ["b"], ["c"]]
+
+def test_iter_sections_is_lazy():
+    def lines():
+        yield "a"
+        yield ""
+        yield "b"
+        raise AssertionError("read past the second section")
+
+    sections = iter_sections(lines())
+    assert next(sections) == ["a"]
+
+def test_iter_sections_text():
+    assert list(iter_sections(TEXT)) == [["  a  "], ["b"], ["c"]]
+    assert list(iter_sections(b"1\n2\n\n3")) == [[b"1", b"2"], [b"3"]]
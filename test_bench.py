@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from bench import Timing, compare, benchmark_cases, case_name, main, time_case
+import run
+
+
+def test_compare_flags_slower_cases():
+    baseline = {"a": Timing(1.0, 0.9, 5), "b": Timing(1.0, 0.9, 5)}
+    current = {"a": Timing(1.2, 0.95, 5), "b": Timing(1.0, 1.35, 5)}
+    regressions = compare(baseline, current, threshold=10.0)
+    assert [r.case for r in regressions] == ["b"]
+    assert regressions[0].change == pytest.approx(50.0)
+
+def test_compare_ignores_noise():
+    baseline = {"a": Timing(10e-6, 10e-6, 5), "b": Timing(0.01, 0.01, 5)}
+    current = {"a": Timing(20e-6, 20e-6, 5), "b": Timing(0.02, 0.02, 5)}
+    assert [r.case for r in compare(baseline, current, noise_floor=1e-4)] == ["b"]
+    assert len(compare(baseline, current, noise_floor=0)) == 2
+
+def test_time_case_times_each_call():
+    calls = []
+    timing = time_case(lambda: calls.append(1), (), repeat=3, warmup=1)
+    assert len(calls) > timing.runs
+    assert timing.runs >= 3
+    assert 0 < timing.best <= timing.median < 1e-3
+
+def test_compare_flags_memory_growth():
+    baseline = {"a": Timing(1.0, 0.9, 5, peak_memory=1000)}
+    current = {"a": Timing(1.0, 0.9, 5, peak_memory=2000)}
+    regressions = compare(baseline, current, threshold=10.0)
+    assert [(r.case, r.metric) for r in regressions] == [("a", "memory")]
+
+def test_timing_json_round_trip():
+    timing = Timing(1.0, 0.9, 5, peak_memory=1000, top_allocations=[("day1/day1.py:10", 800)])
+    assert Timing.from_json(timing.to_json()) == timing
+    assert "peak_memory" not in Timing(1.0, 0.9, 5).to_json()
+
+def test_compare_ignores_new_cases():
+    current = {"new": Timing(1.0, 1.0, 1)}
+    assert compare({}, current) == []
+
+def test_sample_cases_solve():
+    for day, part in [(2, 1), (6, 2), (7, 1), (15, 1)]:
+        solver = getattr(run.load_day(day), run.SOLVERS[part])
+        cases = benchmark_cases(day, part, inputs=False)
+        assert cases[0][0] == case_name(day, part, "sample0")
+        for _, args in cases:
+            solver(*args)
+
+def test_compare_without_baseline(tmp_path):
+    missing = tmp_path / "bench_baseline.json"
+    assert main(["2", "--samples-only", "--compare", "--baseline", str(missing)]) == 2
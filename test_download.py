@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock, Thread
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+pytest.importorskip("markdownify")
+
+import aoc
+import download
+
+
+PAGE = "<html><body><main><h2>Day {day}</h2></main></body></html>"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves puzzle pages and inputs, failing the first request for day 2's
+    input, and serving a page without a <main> element for day 4.
+    """
+    lock = Lock()
+    requests = []
+
+    def do_GET(self):
+        with self.lock:
+            first_try = self.path not in self.requests
+            self.requests.append(self.path)
+        day = self.path.split("/")[3]
+        if self.path.endswith("/input"):
+            if day == "2" and first_try:
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = f"input {day}\n"
+        elif day == "4":
+            body = "<html><body><p>No puzzle here</p></body></html>"
+        else:
+            body = PAGE.format(day=day)
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def client():
+    StandInHandler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    host, port = httpd.server_address
+    url_template = f"http://{host}:{port}/{{year}}/day/{{day}}{{path}}"
+    yield aoc.Client(year="2022", cache_dir=None, url_template=url_template)
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_download_days(client, tmp_path):
+    (tmp_path / "day3").mkdir()
+    (tmp_path / "day3" / "input.txt").write_text("existing\n")
+
+    written, failed = download.download_days(
+        client, "2022", [1, 2, 3], base_dir=tmp_path, workers=3, rate=0, backoff=0
+    )
+
+    assert len(written) == 5 and failed == []
+    assert (tmp_path / "day1" / "input.txt").read_text() == "input 1\n"
+    assert (tmp_path / "day2" / "input.txt").read_text() == "input 2\n"
+    assert (tmp_path / "day3" / "input.txt").read_text() == "existing\n"
+    assert "Day 2" in (tmp_path / "day2" / "day2.md").read_text()
+    assert StandInHandler.requests.count("/2022/day/2/input") == 2
+    assert "/2022/day/3/input" not in StandInHandler.requests
+
+def test_download_days_continues_after_bad_page(client, tmp_path):
+    written, failed = download.download_days(
+        client, "2022", [4, 5], base_dir=tmp_path, workers=1, rate=0, backoff=0
+    )
+
+    assert failed == [tmp_path / "day4" / "day4.md"]
+    assert not (tmp_path / "day4" / "day4.md").exists()
+    assert (tmp_path / "day4" / "input.txt") in written
+    assert (tmp_path / "day5" / "day5.md") in written
+    assert len(written) == 3
+
+def test_main_reports_failed_days(monkeypatch):
+    failed = []
+    monkeypatch.setattr(download.aoc, "Client", lambda **kwargs: None)
+    monkeypatch.setattr(download, "download_days", lambda *args, **kwargs: ([], failed))
+    assert download.main(["--days", "1-3", "--no-cache"]) == 0
+    failed.append(Path("day2/input.txt"))
+    assert download.main(["--days", "1-3", "--no-cache"]) == 1
+    with pytest.raises(download.run.UsageError):
+        download.main(["--days", "0-26"])
+
+def test_markdown_stack_is_imported_lazily():
+    code = "import sys, download; print(sorted({'bs4', 'markdownify'} & set(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(download.__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.strip() == "[]"
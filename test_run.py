@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import cProfile
+import itertools
+import os
+import pstats
+import time
+
+import pytest
+
+import run
+
+
+def test_parse_days():
+    assert run.parse_days("1-3,5", range(1, 26)) == [1, 2, 3, 5]
+    with pytest.raises(run.UsageError):
+        run.parse_days("26", range(1, 26))
+    with pytest.raises(run.UsageError):
+        run.parse_days("1-x", range(1, 26))
+    assert run.parse_days("all", range(1, 4)) == [1, 2, 3]
+
+def test_schedule_puts_slowest_first():
+    timings = {"1.1": 0.1, "1.2": 5.0, "2.1": 1.0}
+    jobs = [(1, 1), (1, 2), (2, 1), (2, 2)]
+    assert run.schedule(jobs, timings) == [(2, 2), (1, 2), (2, 1), (1, 1)]
+
+def test_run_parts_parallel():
+    jobs = [(1, 1), (2, 1), (2, 2), (6, 1), (6, 2)]
+    timings = {"6.2": 1.0, "1.1": 0.5}
+    outcomes = run.run_parts_parallel(jobs, workers=2, timings=timings, check=True)
+    assert [(r.day, r.part) for r in outcomes] == jobs
+    serial = run.run_parts(jobs, check=True)
+    assert [(r.result, r.error) for r in outcomes] == [(r.result, r.error) for r in serial]
+    assert all(r.result is not None and not r.error for r in outcomes)
+
+def test_expected_result():
+    assert run.expected_result(2, 1) == 12156
+    assert run.expected_result(1, 1) is None
+
+def test_result_cache(tmp_path):
+    cache = run.ResultCache(tmp_path)
+    key = cache.key(2, 1)
+    assert key != cache.key(2, 2)
+    assert cache.get(key) is None
+
+    outcome = run.run_part(2, 1, cache=cache)
+    assert not outcome.cached
+    cached = run.run_part(2, 1, cache=cache)
+    assert cached.cached and cached.result == outcome.result
+
+def test_result_cache_key_covers_loader(tmp_path, monkeypatch):
+    cache = run.ResultCache(tmp_path)
+    loader = tmp_path / "aoc_input.py"
+    loader.write_text("# version 1\n")
+    monkeypatch.setattr(run, "LOADER_SOURCES", (loader,))
+    key = cache.key(2, 1)
+    loader.write_text("# version 2\n")
+    assert cache.key(2, 1) != key
+
+    key = cache.key(13, 1)
+    monkeypatch.setitem(run.LOAD_OPTIONS, 13, {"blank_lines": False})
+    assert cache.key(13, 1) != key
+
+def test_result_cache_eviction(tmp_path):
+    cache = run.ResultCache(tmp_path, max_size=250, max_age=3600)
+    for idx in range(4):
+        outcome = run.PartResult(day=1, part=1, result="x" * 50)
+        cache.put(f"key{idx}", outcome)
+        stamp = time.time() - 100 * (4 - idx)
+        os.utime(tmp_path / f"key{idx}.json", (stamp, stamp))
+    os.utime(tmp_path / "key0.json", (0, 0))
+
+    cache.evict()
+    assert sorted(path.stem for path in tmp_path.iterdir()) == ["key2", "key3"]
+
+def test_memory_tracer():
+    with run.MemoryTracer() as tracer:
+        kept = bytearray(2**20)
+    assert 2**20 <= tracer.peak < 2**20 + 2**16
+    site, size = tracer.top_allocations[0]
+    assert site.startswith("test_run.py:") and size >= 2**20
+    del kept
+
+def test_memory_tracer_freed_allocation():
+    with run.MemoryTracer() as tracer:
+        freed = bytearray(2**20)
+        time.sleep(10 * run.MEMORY_POLL_INTERVAL)
+        del freed
+    assert tracer.peak >= 2**20
+    site, size = tracer.top_allocations[0]
+    assert site.startswith("test_run.py:") and size >= 2**20
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+def small():
+    for _ in range(5):
+        busy(20000)
+
+def large():
+    busy(50000)
+
+def nested():
+    small()
+    large()
+
+def label(func):
+    return run.function_label((func.__code__.co_filename, func.__code__.co_firstlineno, func.__name__))
+
+def test_save_profile(tmp_path):
+    # Count profiler events instead of reading a clock, so the times are exact.
+    profiler = cProfile.Profile(itertools.count().__next__, 1e-6)
+    profiler.runcall(nested)
+    path = run.profile_path(tmp_path, 1, 2)
+    run.save_profile(profiler, path)
+    assert path.with_suffix(".pstats").exists()
+
+    lines = path.with_suffix(".collapsed").read_text().splitlines()
+    stacks = {}
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert count.isdigit() and all(stack.split(";"))
+        stacks[stack] = int(count)
+
+    def under(*funcs):
+        prefix = ";".join(label(func) for func in funcs)
+        return sum(count for stack, count in stacks.items() if stack.startswith(prefix))
+
+    # busy() runs 100000 steps when called by small(), and 50000 by large().
+    assert under(nested, small, busy) / under(nested, large, busy) == pytest.approx(2, rel=1e-3)
+
+    stats = pstats.Stats(profiler)
+    root_time = sum(entry[3] for entry in stats.stats.values() if not entry[4])
+    assert sum(stacks.values()) == pytest.approx(root_time * 1e6, abs=len(lines))